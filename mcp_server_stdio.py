@@ -10,194 +10,784 @@ description: MCP server for managing and monitoring Proxmox VMs and nodes using
 """
 
 import asyncio
+import contextvars
+import functools
+import heapq
 import json
 import logging
 import os
+import re
+import ssl
 import sys
-from typing import Dict, Any, List, Optional
-import urllib3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, is_dataclass
+from operator import itemgetter
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Any,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# orjson is an optional speedup; without it results go through the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
 from mcp.server import Server
+from mcp.server.lowlevel.server import request_ctx
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
-from proxmoxer import ProxmoxAPI
+from mcp.types import CallToolResult, Tool, TextContent
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# proxmoxer pulls in requests and urllib3; it is imported in _connect so
+# startup and the missing-variable check in main() don't pay for it
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI, ProxmoxResource
+    from requests.adapters import HTTPAdapter
+
+# os.environ is a dict subclass; probing it directly skips the os.getenv wrapper
+_ENV = os.environ
+_env_get = _ENV.get
 
-# Setup logging to stderr so it doesn't interfere with stdio communication
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stderr,
-)
 logger = logging.getLogger("ProxmoxMCP")
 
+# Required ProxmoxConfig fields and the variables accepted for each, in lookup order
+_ENV_ALIASES = {
+    "host": ("PROXMOX_HOST",),
+    "token_name": ("PROXMOX_TOKEN_ID", "PROXMOX_TOKEN_NAME"),
+    "token_value": ("PROXMOX_TOKEN_SECRET", "PROXMOX_TOKEN_VALUE"),
+}
 
-class ProxmoxManager:
-    """Manages Proxmox API connections and operations."""
+_MISSING_ENV_MSG = (
+    "Missing required environment variables: "
+    "PROXMOX_HOST, PROXMOX_TOKEN_ID, PROXMOX_TOKEN_SECRET"
+)
 
-    def __init__(self):
-        """Initialize Proxmox connection from environment variables."""
-        self.host = os.getenv("PROXMOX_HOST")
-        self.user = os.getenv("PROXMOX_USER", "root@pam")
-        self.token_name = os.getenv("PROXMOX_TOKEN_ID")
-        self.token_value = os.getenv("PROXMOX_TOKEN_SECRET")
-        self.verify_ssl = os.getenv("PROXMOX_VERIFY_SSL", "false").lower() == "true"
-
-        # Ensure the host does not have a duplicate port
-        if self.host and ":" in self.host.split("//")[-1]:
-            self.host = self.host.rsplit(":", 1)[0]
-
-        if not all([self.host, self.token_name, self.token_value]):
+# Integer ProxmoxConfig fields that must be at least 1, with their variables;
+# a zero semaphore or thread pool would hang or fail every tool call
+_POSITIVE_SETTINGS = (
+    ("pool_size", "PROXMOX_POOL_SIZE"),
+    ("max_concurrency", "PROXMOX_MAX_CONCURRENCY"),
+    ("threads", "PROXMOX_THREADS"),
+)
+
+# Spellings treated as "true" for boolean settings such as PROXMOX_VERIFY_SSL,
+# matched after stripping and lowercasing (see _truthy)
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+# Port of the Proxmox VE API (pveproxy)
+_PROXMOX_PORT = 8006
+
+# Upper bound in seconds on reusing listings that carry guest run state or
+# node online state; the others use ProxmoxConfig.cache_ttl (PROXMOX_CACHE_TTL)
+_GUEST_TTL = 5.0
+
+# Seconds to remember a failed fetch
+_NEGATIVE_TTL = 1.0
+
+# Seconds to skip guest-agent probes for a VM whose agent did not respond
+_AGENT_TTL = 300.0
+
+# Seconds to reuse a fetched firewall ruleset
+_FIREWALL_TTL = 10.0
+
+# Upper bound on memoized resource handles; keys come from client-supplied
+# node names and IDs, so typos would otherwise grow the table forever
+_MAX_HANDLES = 1024
+
+# Upper bound on entries in each cache keyed partly by client input (_Cache,
+# the agent negative cache); expired entries go first, then the oldest
+_MAX_CACHE_ENTRIES = 1024
+
+# key=value pairs of a guest netN option string, e.g. "virtio=AA:BB,bridge=vmbr0"
+_NET_OPTION = re.compile(r"([^,=]+)=([^,]*)")
+
+# Shared read-only stand-in for an API response that came back empty
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Task fields reported by get_recent_tasks, with their defaults
+_TASK_FIELDS = (
+    ("upid", None),
+    ("node", None),
+    ("pid", None),
+    ("pstart", None),
+    ("type", None),
+    ("status", "running"),
+    ("user", None),
+    ("starttime", 0),
+    ("endtime", 0),
+)
+
+# Firewall rule fields reported by get_firewall_status, with their defaults
+_RULE_FIELDS = (
+    ("pos", None),
+    ("type", None),
+    ("action", None),
+    ("enable", 1),
+    ("source", "any"),
+    ("dest", "any"),
+    ("proto", "any"),
+    ("dport", ""),
+    ("sport", ""),
+    ("comment", ""),
+)
+
+
+def _first_env(*keys: str, env=_ENV) -> Optional[str]:
+    """Return the value of the first key in ``keys`` that is set and non-empty."""
+    for key in keys:
+        value = env.get(key)
+        if value:
+            return value
+    return None
+
+
+# Async callback taking (completed, total, message), used to report fan-out progress
+ProgressCallback = Callable[[int, int, str], Awaitable[None]]
+
+
+def _as_list(value: Any, sep: str = ",") -> List[Any]:
+    """Normalize a list-valued API field that may arrive joined with sep.
+
+    Depending on the Proxmox version these fields are either a list already
+    or a separator-joined string; lists pass through unsplit.
+    """
+    if isinstance(value, list):
+        return value
+    return value.split(sep) if value else []
+
+
+def _truthy(value: str) -> bool:
+    """Whether a setting such as PROXMOX_VERIFY_SSL spells "true", in any case."""
+    return value.strip().lower() in _TRUTHY
+
+
+def _agent_enabled(value: Any) -> bool:
+    """Whether a qemu "agent" option ("1", "enabled=1,fstrim_cloned_disks=1") is on."""
+    if value is None:
+        return False
+    for part in str(value).split(","):
+        key, sep, flag = part.partition("=")
+        if not sep:
+            return _truthy(key)
+        if key == "enabled":
+            return _truthy(flag)
+    return False
+
+
+# Replies are compact JSON: indentation only inflates the stdio stream and the
+# client's context, and clients that want pretty output can re-format
+if orjson is not None:
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a tool result as compact JSON text."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+else:
+
+    def _json_default(obj: Any) -> Any:
+        """Encode dataclass results, which orjson handles natively."""
+        if is_dataclass(obj):
+            return asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a tool result as compact JSON text."""
+        return json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, default=_json_default
+        )
+
+
+class PreEncoded:
+    """A tool result that is already serialized, for replies cached as text."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @classmethod
+    def of(cls, result: Any) -> "PreEncoded":
+        """Serialize result once, as _reply would."""
+        return cls(_dumps(result))
+
+
+def _reply(result: Any) -> List[TextContent]:
+    """Wrap a tool result as the single TextContent block of a tool reply."""
+    if isinstance(result, PreEncoded):
+        return [TextContent(type="text", text=result.text)]
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+def _input_error(message: str) -> CallToolResult:
+    """Error result for tool arguments that do not match the inputSchema."""
+    return CallToolResult(
+        content=[TextContent(type="text", text=f"Input validation error: {message}")],
+        isError=True,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ProxmoxConfig:
+    """Connection settings for a Proxmox host."""
+
+    host: str
+    user: str
+    token_name: str
+    token_value: str
+    verify_ssl: bool
+    pool_size: int = 64
+    cache_ttl: float = 10.0
+    max_concurrency: int = 10
+    threads: int = 16
+
+    def __post_init__(self):
+        if not (self.host and self.token_name and self.token_value):
+            raise ValueError(_MISSING_ENV_MSG)
+        for field, env in _POSITIVE_SETTINGS:
+            value = getattr(self, field)
+            if value < 1:
+                raise ValueError(f"{env} must be at least 1, got {value}")
+        # Written as "not >=" so NaN is rejected too
+        if not self.cache_ttl >= 0:
             raise ValueError(
-                "Missing required environment variables: "
-                "PROXMOX_HOST, PROXMOX_TOKEN_ID, PROXMOX_TOKEN_SECRET"
+                f"PROXMOX_CACHE_TTL must not be negative, got {self.cache_ttl}"
             )
 
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def from_env(cls) -> "ProxmoxConfig":
+        """Read the connection settings from the environment once."""
+        values = {field: _first_env(*keys) for field, keys in _ENV_ALIASES.items()}
+        if values["host"]:
+            values["host"] = cls._normalize_host(values["host"])
+
+        return cls(
+            user=_env_get("PROXMOX_USER", "root@pam"),
+            verify_ssl=_truthy(_env_get("PROXMOX_VERIFY_SSL", "false")),
+            pool_size=int(_env_get("PROXMOX_POOL_SIZE", "64")),
+            cache_ttl=float(_env_get("PROXMOX_CACHE_TTL", "10")),
+            max_concurrency=int(_env_get("PROXMOX_MAX_CONCURRENCY", "10")),
+            threads=int(_env_get("PROXMOX_THREADS", "16")),
+            **values,
+        )
+
+    @staticmethod
+    def _normalize_host(raw: str) -> str:
+        """Reduce a PROXMOX_HOST value to a bare host name or address.
+
+        Any scheme, path and port are dropped (the API port is always
+        _PROXMOX_PORT), so every request shares one connection-pool key.
+        """
+        host = raw.split("//")[-1].split("/", 1)[0]
+        if host.startswith("[") and "]" in host:
+            return host[: host.index("]") + 1]
+        # A single colon is a port; more than one means a bare IPv6 address
+        if host.count(":") == 1:
+            host = host.split(":", 1)[0]
+        return host
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateInfo:
+    """A VM or container template; serialized field by field as JSON."""
+
+    vmid: int
+    name: str
+    node: str
+    type: str
+    disk_size: int
+    memory: int
+    cpus: int
+
+
+@dataclass(frozen=True, slots=True)
+class FirewallView:
+    """A firewall ruleset normalized once per fetch.
+
+    in_rules and out_rules hold the enabled rules for each direction in
+    position order.
+    """
+
+    target: str
+    enabled: int
+    policy_in: str
+    policy_out: str
+    log_level: str
+    rules: Tuple[Dict[str, Any], ...]
+    in_rules: Tuple[Dict[str, Any], ...]
+    out_rules: Tuple[Dict[str, Any], ...]
+
+    @classmethod
+    def build(
+        cls, target: str, options: Mapping[str, Any], rules: Sequence[Dict[str, Any]]
+    ) -> "FirewallView":
+        """Normalize raw API options and rules into a view."""
+        normalized = tuple(
+            {field: rule.get(field, default) for field, default in _RULE_FIELDS}
+            for rule in rules
+        )
+        enabled = [rule for rule in normalized if rule["enable"]]
+        return cls(
+            target=target,
+            enabled=options.get("enable", 0),
+            policy_in=options.get("policy_in", "ACCEPT"),
+            policy_out=options.get("policy_out", "ACCEPT"),
+            log_level=options.get("log_level_in", "nolog"),
+            rules=normalized,
+            in_rules=tuple(rule for rule in enabled if rule["type"] == "in"),
+            out_rules=tuple(rule for rule in enabled if rule["type"] == "out"),
+        )
+
+    def to_dict(self, direction: Optional[str] = None) -> Dict[str, Any]:
+        """Tool result shape of get_firewall_status.
+
+        With direction ("in" or "out") only the enabled rules for it are listed.
+        """
+        if direction == "in":
+            rules = self.in_rules
+        elif direction == "out":
+            rules = self.out_rules
+        else:
+            rules = self.rules
+        return {
+            "target": self.target,
+            "enabled": self.enabled,
+            "policy_in": self.policy_in,
+            "policy_out": self.policy_out,
+            "log_level": self.log_level,
+            "rules": list(rules),
+        }
+
+
+def _make_room(
+    entries: Dict[Any, Any], expiry: Callable[[Any], float], now: float
+) -> None:
+    """Free a slot in a full table: drop expired entries, else the oldest.
+
+    The caller holds the lock guarding entries.
+    """
+    if len(entries) < _MAX_CACHE_ENTRIES:
+        return
+    for key in [key for key, value in entries.items() if expiry(value) <= now]:
+        del entries[key]
+    if len(entries) >= _MAX_CACHE_ENTRIES:
+        # dicts keep insertion order, so the first key is the oldest
+        del entries[next(iter(entries))]
+
+
+class _Cache:
+    """Small TTL cache for API listings, keyed by name.
+
+    A failed load is cached for _NEGATIVE_TTL seconds and re-raised, so a
+    flapping API does not stall every call in a burst. At most
+    _MAX_CACHE_ENTRIES keys are kept.
+    """
+
+    __slots__ = ("_entries", "_lock")
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: float, loader: Callable[[], Any]) -> Any:
+        """Return loader() reusing the last result for ttl seconds.
+
+        A ttl of 0 turns caching off for the call, failures included.
+        """
+        if ttl <= 0:
+            return loader()
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry[0]:
+            if isinstance(entry[1], Exception):
+                raise entry[1]
+            return entry[1]
+
+        try:
+            value = loader()
+        except Exception as e:
+            self._store(key, now + _NEGATIVE_TTL, e)
+            raise
+        self._store(key, now + ttl, value)
+        return value
+
+    def _store(self, key: str, expires: float, value: Any) -> None:
+        with self._lock:
+            if key not in self._entries:
+                _make_room(self._entries, itemgetter(0), time.monotonic())
+            self._entries[key] = (expires, value)
+
+
+def _tls_adapter(ssl_context: ssl.SSLContext, **kwargs) -> "HTTPAdapter":
+    """HTTPAdapter whose connection pools all use ssl_context."""
+    from requests.adapters import HTTPAdapter
+
+    class TLSAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **pool_kwargs):
+            pool_kwargs["ssl_context"] = ssl_context
+            return super().init_poolmanager(*args, **pool_kwargs)
+
+    return TLSAdapter(**kwargs)
+
+
+class ProxmoxManager:
+    """Manages Proxmox API connections and operations."""
+
+    __slots__ = (
+        "config",
+        "proxmox",
+        "_cache",
+        "_resources",
+        "_resources_lock",
+        "_agent_down",
+        "_agent_lock",
+        "_sem",
+        "_executor",
+    )
+
+    def __init__(self, config: Optional[ProxmoxConfig] = None):
+        """Initialize Proxmox connection, defaulting to environment settings."""
+        self.config = config or ProxmoxConfig.from_env()
+        self._cache = _Cache()
+        self._agent_down: Dict[Tuple[str, int], float] = {}
+        self._agent_lock = threading.Lock()
+        self._resources: Dict[Tuple[Any, ...], "ProxmoxResource"] = {}
+        self._resources_lock = threading.Lock()
+        # Bounds in-flight API calls across all tools so pveproxy isn't flooded
+        self._sem = asyncio.Semaphore(self.config.max_concurrency)
+        # Blocking proxmoxer calls get their own pool instead of the loop's
+        # default executor, which is shared with every other to_thread user
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.threads, thread_name_prefix="pve"
+        )
         self.proxmox = self._connect()
-        logger.info(f"Connected to Proxmox host: {self.host}")
+        logger.info("Connected to Proxmox host: %s", self.config.host)
 
-    def _connect(self) -> ProxmoxAPI:
+    def _connect(self) -> "ProxmoxAPI":
         """Create Proxmox API connection."""
+        import urllib3
+        from proxmoxer import ProxmoxAPI
+        from urllib3.util.retry import Retry
+
+        if not self.config.verify_ssl:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
         try:
-            # Ensure the host does not have a duplicate port
-            if self.host and ":" in self.host.split("//")[-1]:
-                self.host = self.host.rsplit(":", 1)[0]
-
-            return ProxmoxAPI(
-                self.host,
-                user=self.user,
-                token_name=self.token_name,
-                token_value=self.token_value,
-                verify_ssl=self.verify_ssl,
+            api = ProxmoxAPI(
+                self.config.host,
+                port=_PROXMOX_PORT,
+                user=self.config.user,
+                token_name=self.config.token_name,
+                token_value=self.config.token_value,
+                verify_ssl=self.config.verify_ssl,
             )
-        except Exception as e:
-            logger.error(f"Failed to connect to Proxmox: {e}")
+
+            # Keep enough warm connections for the concurrent fan-out; the default
+            # pool of 10 discards connections and forces a new TLS handshake
+            adapter = _tls_adapter(
+                self._ssl_context(),
+                pool_maxsize=self.config.pool_size,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.2,
+                    status_forcelist=[502, 503, 504],
+                    raise_on_status=False,
+                ),
+            )
+            api._store["session"].mount("https://", adapter)
+            return api
+        except Exception:
+            logger.exception("Failed to connect to Proxmox")
             raise
 
+    def _ssl_context(self) -> ssl.SSLContext:
+        """TLS settings shared by every pooled connection.
+
+        The context pins TLS 1.2 as the minimum. It starts with no trusted CAs:
+        with verify_ssl on, requests still hands urllib3 its CA bundle, which
+        is loaded into this context for each new connection as before.
+        """
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+        if not self.config.verify_ssl:
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+        return ctx
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking proxmoxer call in a worker thread.
+
+        Worker threads share the one ProxmoxAPI session. That is safe for
+        API-token auth: the token header is set on each prepared request and
+        there is no ticket or CSRF state to refresh, and the pooled
+        HTTPAdapter hands each thread its own connection.
+        """
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread, carry the caller's context (e.g. the MCP
+        # request context) into the worker thread
+        ctx = contextvars.copy_context()
+        async with self._sem:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(ctx.run, fn, *args, **kwargs)
+            )
+
+    async def dispatch(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Run the handler registered for tool name with its arguments.
+
+        Blocking handlers go to a worker thread; async ones are awaited on
+        the event loop without taking a thread or a concurrency permit.
+        """
+        handler = _ASYNC_DISPATCH.get(name)
+        if handler is not None:
+            return await handler(self, arguments)
+        handler = _DISPATCH.get(name)
+        if handler is None:
+            return {"error": f"Unknown tool: {name}"}
+        return await self._run(handler, self, arguments)
+
+    def close(self) -> None:
+        """Release the worker threads without waiting for in-flight calls."""
+        self._executor.shutdown(wait=False)
+
+    # proxmoxer builds a fresh resource object per path segment; the node and
+    # guest handles are reused so repeated calls only build the leaf segments
+    def _handle(
+        self, key: Tuple[Any, ...], build: Callable[[], "ProxmoxResource"]
+    ) -> "ProxmoxResource":
+        """Return the memoized handle for key, evicting the oldest when full."""
+        handle = self._resources.get(key)
+        if handle is None:
+            handle = build()
+            with self._resources_lock:
+                if len(self._resources) >= _MAX_HANDLES:
+                    # dicts keep insertion order, so the first key is the oldest
+                    del self._resources[next(iter(self._resources))]
+                self._resources[key] = handle
+        return handle
+
+    def _node(self, node: str) -> "ProxmoxResource":
+        """Memoized handle for nodes/{node}."""
+        return self._handle(("node", node), lambda: self.proxmox.nodes(node))
+
+    def _qemu(self, node: str, vmid: int) -> "ProxmoxResource":
+        """Memoized handle for nodes/{node}/qemu/{vmid}."""
+        return self._handle(("qemu", node, vmid), lambda: self._node(node).qemu(vmid))
+
+    def _lxc(self, node: str, vmid: int) -> "ProxmoxResource":
+        """Memoized handle for nodes/{node}/lxc/{vmid}."""
+        return self._handle(("lxc", node, vmid), lambda: self._node(node).lxc(vmid))
+
+    def _listing(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Result of a cluster listing call, cached for the configured TTL."""
+        return self._cache.get(key, self.config.cache_ttl, fn)
+
+    def _live_listing(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Like _listing, but cached for at most _GUEST_TTL seconds."""
+        return self._cache.get(key, min(_GUEST_TTL, self.config.cache_ttl), fn)
+
+    def _guests(self) -> List[Dict[str, Any]]:
+        """All cluster VMs and containers, cached for at most _GUEST_TTL seconds."""
+        return self._live_listing(
+            "guests", lambda: self.proxmox.cluster.resources.get(type="vm") or []
+        )
+
+    def find_node(self, vmid: int) -> str:
+        """Return the node hosting a guest, from a cached vmid -> node index."""
+        index = self._live_listing(
+            "vmid_index",
+            lambda: {guest["vmid"]: guest["node"] for guest in self._guests()},
+        )
+        try:
+            return index[vmid]
+        except KeyError:
+            raise ValueError(f"Guest {vmid} not found in cluster") from None
+
     # Node operations
-    def get_nodes(self) -> Dict[str, Any]:
+    def get_nodes(self) -> Union[Dict[str, Any], "PreEncoded"]:
         """Get all nodes in the cluster."""
+
+        def load() -> PreEncoded:
+            nodes = self.proxmox.nodes.get() or []
+            return PreEncoded.of({"nodes": nodes, "count": len(nodes)})
+
         try:
-            nodes = self.proxmox.nodes.get()
-            if nodes is None:
-                nodes = []
-            return {"nodes": nodes, "count": len(nodes)}
+            # The reply is cached already encoded, so cache hits skip _dumps
+            return self._listing("nodes", load)
         except Exception as e:
-            logger.error(f"Failed to get nodes: {e}")
+            logger.exception("Failed to get nodes")
             return {"error": str(e)}
 
     def get_node_status(self, node: str) -> Dict[str, Any]:
         """Get detailed status for a specific node."""
         try:
-            status = self.proxmox.nodes(node).status.get()
+            status = self._node(node).status.get()
             return status or {"error": "No status data returned"}
         except Exception as e:
-            logger.error(f"Failed to get node status: {e}")
+            logger.exception("Failed to get node status")
             return {"error": str(e)}
 
+    async def _guests_of(self, guest_type: str) -> List[Dict[str, Any]]:
+        """Cached cluster guests of one type, "qemu" or "lxc"."""
+        return [g for g in await self._run(self._guests) if g["type"] == guest_type]
+
+    @staticmethod
+    def _guest_summary(key: str, guests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reply shape shared by the VM and container listings."""
+        return {
+            key: guests,
+            "total": len(guests),
+            "nodes_checked": len({guest["node"] for guest in guests}),
+        }
+
     # VM operations
-    def get_vms(self) -> Dict[str, Any]:
+    async def get_vms(self) -> Dict[str, Any]:
         """Get all VMs across the cluster."""
         try:
-            nodes = self.proxmox.nodes.get()
-            if nodes is None:
-                nodes = []
-            all_vms = []
+            return self._guest_summary("vms", await self._guests_of("qemu"))
+        except Exception as e:
+            logger.exception("Failed to get VMs")
+            return {"error": str(e)}
 
-            for node in nodes:
-                node_name = node["node"]
-                try:
-                    node_vms = self.proxmox.nodes(node_name).qemu.get()
-                    if node_vms is not None:
-                        for vm in node_vms:
-                            vm["node"] = node_name
-                            all_vms.append(vm)
-                except Exception as e:
-                    logger.warning(f"Could not get VMs from node {node_name}: {e}")
-
-            return {"vms": all_vms, "total": len(all_vms), "nodes_checked": len(nodes)}
+    async def get_vms_with_status(self) -> Dict[str, Any]:
+        """Get all VMs with each VM's current status fetched concurrently."""
+        try:
+            vms = await self._guests_of("qemu")
+            statuses = await asyncio.gather(
+                *(self._run(self.get_vm_status, vm["node"], vm["vmid"]) for vm in vms)
+            )
+            return self._guest_summary(
+                "vms",
+                [{**vm, "current": status} for vm, status in zip(vms, statuses)],
+            )
         except Exception as e:
-            logger.error(f"Failed to get VMs: {e}")
+            logger.exception("Failed to get VMs with status")
             return {"error": str(e)}
 
     # Container operations
-    def get_containers(self) -> Dict[str, Any]:
+    async def get_containers(self) -> Dict[str, Any]:
         """Get all LXC containers across the cluster."""
         try:
-            nodes = self.proxmox.nodes.get()
-            if nodes is None:
-                nodes = []
-            all_containers = []
-
-            for node in nodes:
-                node_name = node["node"]
-                try:
-                    node_containers = self.proxmox.nodes(node_name).lxc.get()
-                    if node_containers is not None:
-                        for container in node_containers:
-                            container["node"] = node_name
-                            all_containers.append(container)
-                except Exception as e:
-                    logger.warning(
-                        f"Could not get containers from node {node_name}: {e}"
-                    )
-
-            return {
-                "containers": all_containers,
-                "total": len(all_containers),
-                "nodes_checked": len(nodes),
-            }
+            return self._guest_summary("containers", await self._guests_of("lxc"))
         except Exception as e:
-            logger.error(f"Failed to get containers: {e}")
+            logger.exception("Failed to get containers")
             return {"error": str(e)}
 
     def start_vm(self, node: str, vmid: int) -> Dict[str, Any]:
         """Start a VM."""
         try:
-            result = self.proxmox.nodes(node).qemu(vmid).status.start.post()
+            result = self._qemu(node, vmid).status.start.post()
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"VM {vmid} start initiated on node {node}",
             }
         except Exception as e:
-            logger.error(f"Failed to start VM {vmid}: {e}")
+            logger.exception("Failed to start VM %s", vmid)
             return {"error": str(e)}
 
     def stop_vm(self, node: str, vmid: int) -> Dict[str, Any]:
         """Stop a VM."""
         try:
-            result = self.proxmox.nodes(node).qemu(vmid).status.shutdown.post()
+            result = self._qemu(node, vmid).status.shutdown.post()
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"VM {vmid} stop initiated on node {node}",
             }
         except Exception as e:
-            logger.error(f"Failed to stop VM {vmid}: {e}")
+            logger.exception("Failed to stop VM %s", vmid)
             return {"error": str(e)}
 
     def reboot_vm(self, node: str, vmid: int) -> Dict[str, Any]:
         """Reboot a VM."""
         try:
-            result = self.proxmox.nodes(node).qemu(vmid).status.reboot.post()
+            result = self._qemu(node, vmid).status.reboot.post()
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"VM {vmid} reboot initiated on node {node}",
             }
         except Exception as e:
-            logger.error(f"Failed to reboot VM {vmid}: {e}")
+            logger.exception("Failed to reboot VM %s", vmid)
             return {"error": str(e)}
 
+    def _bulk_power(
+        self, node: str, action: str, vmids: Optional[List[int]], **params
+    ) -> Dict[str, Any]:
+        """POST nodes/{node}/startall or stopall, optionally limited to vmids."""
+        if vmids is not None:
+            # An empty selection must not widen to every guest on the node
+            if not vmids:
+                raise ValueError("vmids must list at least one VM ID")
+            params["vms"] = ",".join(map(str, vmids))
+        result = getattr(self._node(node), action).post(**params)
+        targets = f"guests {params['vms']}" if vmids is not None else "all guests"
+        return {
+            "success": True,
+            "task_id": result,
+            "message": f"{action} initiated for {targets} on node {node}",
+        }
+
+    def bulk_start_vms(
+        self, node: str, vmids: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """Start every guest on a node (or just vmids) in a single request."""
+        try:
+            # Without force startall only starts guests that have onboot=1 set
+            return self._bulk_power(node, "startall", vmids, force=1)
+        except Exception as e:
+            logger.exception("Failed to bulk start guests on node %s", node)
+            return {"error": str(e)}
+
+    def bulk_stop_vms(
+        self, node: str, vmids: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """Stop every guest on a node (or just vmids) in a single request."""
+        try:
+            return self._bulk_power(node, "stopall", vmids)
+        except Exception as e:
+            logger.exception("Failed to bulk stop guests on node %s", node)
+            return {"error": str(e)}
+
+    async def bulk_reboot_vms(self, node: str, vmids: List[int]) -> Dict[str, Any]:
+        """Reboot several VMs on one node.
+
+        Proxmox has no bulk reboot endpoint, so this fans out to the per-VM one.
+        """
+        results = await asyncio.gather(
+            *(self._run(self.reboot_vm, node, vmid) for vmid in vmids),
+            return_exceptions=True,
+        )
+        return {
+            "node": node,
+            "results": [
+                (
+                    {"vmid": vmid, "error": str(result)}
+                    if isinstance(result, Exception)
+                    else {"vmid": vmid, **result}
+                )
+                for vmid, result in zip(vmids, results)
+            ],
+        }
+
     def execute_vm_command(self, node: str, vmid: int, command: str) -> Dict[str, Any]:
         """Execute a command in a VM via QEMU guest agent."""
         try:
-            result = (
-                self.proxmox.nodes(node).qemu(vmid).agent.exec.post(command=command)
-            )
+            result = self._qemu(node, vmid).agent.exec.post(command=command)
             if result is None:
                 return {"error": "No response from VM agent"}
             return {
@@ -206,7 +796,7 @@ class ProxmoxManager:
                 "exit_code": result.get("exitcode", 0),
             }
         except Exception as e:
-            logger.error(f"Failed to execute command: {e}")
+            logger.exception("Failed to execute command")
             return {"error": str(e)}
 
     def create_vm_snapshot(
@@ -218,80 +808,80 @@ class ProxmoxManager:
             if description is not None:
                 params["description"] = description
 
-            result = self.proxmox.nodes(node).qemu(vmid).snapshot.post(**params)
+            result = self._qemu(node, vmid).snapshot.post(**params)
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"Snapshot '{name}' creation initiated for VM {vmid}",
             }
         except Exception as e:
-            logger.error(f"Failed to create snapshot: {e}")
+            logger.exception("Failed to create snapshot")
             return {"error": str(e)}
 
     def list_vm_snapshots(self, node: str, vmid: int) -> Dict[str, Any]:
         """List VM snapshots."""
         try:
-            snapshots = self.proxmox.nodes(node).qemu(vmid).snapshot.get()
+            snapshots = self._qemu(node, vmid).snapshot.get()
             return {"snapshots": snapshots if snapshots is not None else []}
         except Exception as e:
-            logger.error(f"Failed to list snapshots: {e}")
+            logger.exception("Failed to list snapshots")
             return {"error": str(e)}
 
     def get_vm_status(self, node: str, vmid: int) -> Dict[str, Any]:
         """Get VM status and configuration."""
         try:
-            status = self.proxmox.nodes(node).qemu(vmid).status.current.get()
+            status = self._qemu(node, vmid).status.current.get()
             return status or {"error": "No status data returned"}
         except Exception as e:
-            logger.error(f"Failed to get VM status: {e}")
+            logger.exception("Failed to get VM status")
             return {"error": str(e)}
 
     def get_container_status(self, node: str, vmid: int) -> Dict[str, Any]:
         """Get container status and configuration."""
         try:
-            status = self.proxmox.nodes(node).lxc(vmid).status.current.get()
+            status = self._lxc(node, vmid).status.current.get()
             return status or {"error": "No status data returned"}
         except Exception as e:
-            logger.error(f"Failed to get container status: {e}")
+            logger.exception("Failed to get container status")
             return {"error": str(e)}
 
     def start_container(self, node: str, vmid: int) -> Dict[str, Any]:
         """Start a container."""
         try:
-            result = self.proxmox.nodes(node).lxc(vmid).status.start.post()
+            result = self._lxc(node, vmid).status.start.post()
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"Container {vmid} start initiated on node {node}",
             }
         except Exception as e:
-            logger.error(f"Failed to start container {vmid}: {e}")
+            logger.exception("Failed to start container %s", vmid)
             return {"error": str(e)}
 
     def stop_container(self, node: str, vmid: int) -> Dict[str, Any]:
         """Stop a container."""
         try:
-            result = self.proxmox.nodes(node).lxc(vmid).status.shutdown.post()
+            result = self._lxc(node, vmid).status.shutdown.post()
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"Container {vmid} stop initiated on node {node}",
             }
         except Exception as e:
-            logger.error(f"Failed to stop container {vmid}: {e}")
+            logger.exception("Failed to stop container %s", vmid)
             return {"error": str(e)}
 
     def reboot_container(self, node: str, vmid: int) -> Dict[str, Any]:
         """Reboot a container."""
         try:
-            result = self.proxmox.nodes(node).lxc(vmid).status.reboot.post()
+            result = self._lxc(node, vmid).status.reboot.post()
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"Container {vmid} reboot initiated on node {node}",
             }
         except Exception as e:
-            logger.error(f"Failed to reboot container {vmid}: {e}")
+            logger.exception("Failed to reboot container %s", vmid)
             return {"error": str(e)}
 
     def execute_container_command(
@@ -299,7 +889,7 @@ class ProxmoxManager:
     ) -> Dict[str, Any]:
         """Execute a command in a container via pct exec."""
         try:
-            result = self.proxmox.nodes(node).lxc(vmid).exec.post(command=command)
+            result = self._lxc(node, vmid).exec.post(command=command)
             if result is None:
                 return {"error": "No response from container"}
             return {
@@ -308,7 +898,7 @@ class ProxmoxManager:
                 "exit_code": result.get("exitcode", 0),
             }
         except Exception as e:
-            logger.error(f"Failed to execute command in container: {e}")
+            logger.exception("Failed to execute command in container")
             return {"error": str(e)}
 
     def create_container_snapshot(
@@ -320,43 +910,52 @@ class ProxmoxManager:
             if description is not None:
                 params["description"] = description
 
-            result = self.proxmox.nodes(node).lxc(vmid).snapshot.post(**params)
+            result = self._lxc(node, vmid).snapshot.post(**params)
             return {
                 "success": True,
                 "task_id": result,
                 "message": f"Snapshot '{name}' creation initiated for container {vmid}",
             }
         except Exception as e:
-            logger.error(f"Failed to create container snapshot: {e}")
+            logger.exception("Failed to create container snapshot")
             return {"error": str(e)}
 
     def list_container_snapshots(self, node: str, vmid: int) -> Dict[str, Any]:
         """List container snapshots."""
         try:
-            snapshots = self.proxmox.nodes(node).lxc(vmid).snapshot.get()
+            snapshots = self._lxc(node, vmid).snapshot.get()
             return {"snapshots": snapshots if snapshots is not None else []}
         except Exception as e:
-            logger.error(f"Failed to list container snapshots: {e}")
+            logger.exception("Failed to list container snapshots")
             return {"error": str(e)}
 
     # Storage operations
-    def get_storage(self) -> Dict[str, Any]:
+    def get_storage(self) -> Union[Dict[str, Any], "PreEncoded"]:
         """Get storage information."""
         try:
-            storage = self.proxmox.storage.get()
-            return {"storage": storage if storage is not None else []}
+            return self._listing(
+                "storage",
+                lambda: PreEncoded.of({"storage": self.proxmox.storage.get() or []}),
+            )
         except Exception as e:
-            logger.error(f"Failed to get storage: {e}")
+            logger.exception("Failed to get storage")
             return {"error": str(e)}
 
-    def get_storage_details(self, storage: str) -> Dict[str, Any]:
+    async def get_storage_details(self, storage: str) -> Dict[str, Any]:
         """Get detailed information about a specific storage pool."""
         try:
-            # Get storage configuration
-            config_list = self.proxmox.storage(storage).get()
-            if not config_list:
+            # Storage configuration and cluster-wide usage in parallel
+            config, resources = await asyncio.gather(
+                self._run(self.proxmox.storage(storage).get),
+                self._run(self.proxmox.cluster.resources.get, type="storage"),
+                return_exceptions=True,
+            )
+            if isinstance(config, Exception):
+                raise config
+            if isinstance(config, list):
+                config = config[0] if config else None
+            if not config:
                 return {"error": f"Storage {storage} not found"}
-            config = config_list[0]
 
             details = {
                 "storage": storage,
@@ -384,38 +983,89 @@ class ProxmoxManager:
             elif storage_type in ["dir", "lvm", "lvmthin", "zfs", "zfspool"]:
                 details["path"] = config.get("path", "N/A")
 
-            # Try to get current usage from a node
-            try:
-                nodes = self.proxmox.nodes.get()
-                if nodes and len(nodes) > 0:
-                    node = nodes[0]["node"]
-                    status = self.proxmox.nodes(node).storage(storage).status.get()
-                    if status:
-                        details["status"] = {
-                            "total": status.get("total", 0),
-                            "used": status.get("used", 0),
-                            "available": status.get("avail", 0),
-                            "active": status.get("active", 0),
-                        }
-            except:
-                pass
+            # Current usage, preferring a node where the storage is active;
+            # usage is best-effort, so a failed lookup just omits it
+            if not isinstance(resources, Exception):
+                entries = [r for r in resources or () if r.get("storage") == storage]
+                entries.sort(key=lambda r: r.get("status") != "available")
+                if entries:
+                    usage = entries[0]
+                    total = usage.get("maxdisk", 0)
+                    used = usage.get("disk", 0)
+                    details["status"] = {
+                        "total": total,
+                        "used": used,
+                        "available": total - used,
+                        "active": 1 if usage.get("status") == "available" else 0,
+                    }
 
             return details
 
         except Exception as e:
-            logger.error(f"Failed to get storage details: {e}")
+            logger.exception("Failed to get storage details")
             return {"error": str(e)}
 
-    def get_backups(
-        self, storage: Optional[str] = None, node: Optional[str] = None
+    async def get_backups(
+        self,
+        storage: Optional[str] = None,
+        node: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
-        """List all backups, optionally filtered by storage or node."""
-        try:
-            backups = []
+        """List all backups, optionally filtered by storage or node.
 
+        If progress is given it is awaited as each storage listing completes.
+        """
+        try:
             if storage and node:
                 # Get backups from specific storage on specific node
-                content = self.proxmox.nodes(node).storage(storage).content.get()
+                targets = [(node, storage)]
+            else:
+                # One cluster-wide listing names every (node, storage) pair;
+                # shared storages only need to be read from a single node
+                resources = await self._run(
+                    self.proxmox.cluster.resources.get, type="storage"
+                )
+                targets = []
+                shared_seen = set()
+                for res in resources or ():
+                    if (
+                        "backup" not in res.get("content", "")
+                        or res.get("status") != "available"
+                        or (node and res.get("node") != node)
+                        or (storage and res.get("storage") != storage)
+                    ):
+                        continue
+                    if res.get("shared"):
+                        if res["storage"] in shared_seen:
+                            continue
+                        shared_seen.add(res["storage"])
+                    targets.append((res["node"], res["storage"]))
+
+            completed = 0
+
+            async def list_content(node_name: str, stor: str):
+                nonlocal completed
+                try:
+                    return await self._run(
+                        self._node(node_name).storage(stor).content.get
+                    )
+                finally:
+                    if progress is not None:
+                        completed += 1
+                        await progress(completed, len(targets), f"{node_name}/{stor}")
+
+            results = await asyncio.gather(
+                *(list_content(node_name, stor) for node_name, stor in targets),
+                return_exceptions=True,
+            )
+
+            backups = []
+            for (node_name, stor), content in zip(targets, results):
+                if isinstance(content, Exception):
+                    # A single target failing is only fatal for a filtered listing
+                    if storage and node:
+                        raise content
+                    continue
                 if content is None:
                     content = []
                 for item in content:
@@ -423,67 +1073,38 @@ class ProxmoxManager:
                         backup_info = {
                             "volid": item["volid"],
                             "vmid": item.get("vmid"),
-                            "node": node,
-                            "storage": storage,
+                            "node": node_name,
+                            "storage": stor,
                             "size": item.get("size", 0),
                             "format": item.get("format"),
                             "ctime": item.get("ctime", 0),
                             "notes": item.get("notes", ""),
                         }
                         backups.append(backup_info)
-            else:
-                # Get all backups from all storages on all nodes
-                nodes = self.proxmox.nodes.get()
-                storages = self.proxmox.storage.get()
-
-                if nodes is None:
-                    nodes = []
-                if storages is None:
-                    storages = []
-
-                for node_info in nodes:
-                    node_name = node_info["node"]
-                    for stor in storages:
-                        if "backup" in stor.get("content", ""):
-                            try:
-                                content = (
-                                    self.proxmox.nodes(node_name)
-                                    .storage(stor["storage"])
-                                    .content.get()
-                                )
-                                if content is None:
-                                    content = []
-                                for item in content:
-                                    if item.get("content") == "backup":
-                                        backup_info = {
-                                            "volid": item["volid"],
-                                            "vmid": item.get("vmid"),
-                                            "node": node_name,
-                                            "storage": stor["storage"],
-                                            "size": item.get("size", 0),
-                                            "format": item.get("format"),
-                                            "ctime": item.get("ctime", 0),
-                                            "notes": item.get("notes", ""),
-                                        }
-                                        backups.append(backup_info)
-                            except:
-                                continue
 
             return {"backups": backups, "count": len(backups)}
 
         except Exception as e:
-            logger.error(f"Failed to list backups: {e}")
+            logger.exception("Failed to list backups")
             return {"error": str(e)}
 
     # Cluster operations
-    def get_cluster_status(self) -> Dict[str, Any]:
+    async def get_cluster_status(self) -> Dict[str, Any]:
         """Get comprehensive cluster health and resource summary."""
         try:
-            # Get cluster status
-            cluster_status = self.proxmox.cluster.status.get()
-
-            # Get resource summary
-            resources = self.proxmox.cluster.resources.get(type="node")
+            # Cluster status and the full resource list in one parallel round-trip
+            cluster_status, resources = await asyncio.gather(
+                self._run(
+                    self._live_listing,
+                    "cluster_status",
+                    self.proxmox.cluster.status.get,
+                ),
+                self._run(
+                    self._live_listing,
+                    "resources",
+                    self.proxmox.cluster.resources.get,
+                ),
+            )
             if resources is None:
                 resources = []
 
@@ -520,20 +1141,18 @@ class ProxmoxManager:
                         }
                     )
 
-            # Get VM and container counts
-            vms = self.proxmox.cluster.resources.get(type="vm")
-            if vms is None:
-                vms = []
-            vm_count = sum(1 for vm in vms if vm["type"] == "qemu")
-            ct_count = sum(1 for vm in vms if vm["type"] == "lxc")
-            running_vms = sum(
-                1
-                for vm in vms
-                if vm["type"] == "qemu" and vm.get("status") == "running"
-            )
-            running_cts = sum(
-                1 for vm in vms if vm["type"] == "lxc" and vm.get("status") == "running"
-            )
+            # Get VM and container counts in a single pass
+            vm_count = ct_count = running_vms = running_cts = 0
+            for res in resources:
+                res_type = res["type"]
+                if res_type == "qemu":
+                    vm_count += 1
+                    if res.get("status") == "running":
+                        running_vms += 1
+                elif res_type == "lxc":
+                    ct_count += 1
+                    if res.get("status") == "running":
+                        running_cts += 1
 
             cluster_info = {
                 "name": (
@@ -580,22 +1199,21 @@ class ProxmoxManager:
             return cluster_info
 
         except Exception as e:
-            logger.error(f"Failed to get cluster status: {e}")
+            logger.exception("Failed to get cluster status")
             return {"error": str(e)}
 
     # Task operations
     def get_task_status(self, node: str, upid: str) -> Dict[str, Any]:
         """Get task status."""
         try:
-            # Parse UPID to get task ID
-            parts = upid.split(":")
-            if len(parts) < 3:
+            # A UPID is colon-separated; counting separators avoids building a list
+            if upid.count(":") < 2:
                 return {"error": "Invalid UPID format"}
 
-            status = self.proxmox.nodes(node).tasks(upid).status.get()
+            status = self._node(node).tasks(upid).status.get()
             return status or {"error": "No task status returned"}
         except Exception as e:
-            logger.error(f"Failed to get task status: {e}")
+            logger.exception("Failed to get task status")
             return {"error": str(e)}
 
     # User & Access Control operations
@@ -606,9 +1224,8 @@ class ProxmoxManager:
             if users is None:
                 users = []
 
-            user_list = []
-            for user in users:
-                user_info = {
+            user_list = [
+                {
                     "userid": user["userid"],
                     "enable": user.get("enable", 1),
                     "expire": user.get("expire", 0),
@@ -616,16 +1233,15 @@ class ProxmoxManager:
                     "lastname": user.get("lastname", ""),
                     "email": user.get("email", ""),
                     "comment": user.get("comment", ""),
-                    "groups": (
-                        user.get("groups", "").split(",") if user.get("groups") else []
-                    ),
-                    "tokens": user.get("tokens", []),
+                    "groups": _as_list(user.get("groups")),
+                    "tokens": _as_list(user.get("tokens")),
                 }
-                user_list.append(user_info)
+                for user in users
+            ]
 
             return {"users": user_list, "count": len(user_list)}
         except Exception as e:
-            logger.error(f"Failed to list users: {e}")
+            logger.exception("Failed to list users")
             return {"error": str(e)}
 
     def get_groups(self) -> Dict[str, Any]:
@@ -635,20 +1251,18 @@ class ProxmoxManager:
             if groups is None:
                 groups = []
 
-            group_list = []
-            for group in groups:
-                group_info = {
+            group_list = [
+                {
                     "groupid": group["groupid"],
                     "comment": group.get("comment", ""),
-                    "users": (
-                        group.get("users", "").split(",") if group.get("users") else []
-                    ),
+                    "users": _as_list(group.get("users")),
                 }
-                group_list.append(group_info)
+                for group in groups
+            ]
 
             return {"groups": group_list, "count": len(group_list)}
         except Exception as e:
-            logger.error(f"Failed to list groups: {e}")
+            logger.exception("Failed to list groups")
             return {"error": str(e)}
 
     def get_roles(self) -> Dict[str, Any]:
@@ -658,83 +1272,44 @@ class ProxmoxManager:
             if roles is None:
                 roles = []
 
-            role_list = []
-            for role in roles:
-                role_info = {
+            role_list = [
+                {
                     "roleid": role["roleid"],
-                    "privs": (
-                        role.get("privs", "").split(",") if role.get("privs") else []
-                    ),
+                    "privs": _as_list(role.get("privs")),
                     "special": role.get("special", 0),
                 }
-                role_list.append(role_info)
+                for role in roles
+            ]
 
             return {"roles": role_list, "count": len(role_list)}
         except Exception as e:
-            logger.error(f"Failed to list roles: {e}")
+            logger.exception("Failed to list roles")
             return {"error": str(e)}
 
     # Monitoring operations
-    def get_recent_tasks(
+    async def get_recent_tasks(
         self, node: Optional[str] = None, limit: int = 20
     ) -> Dict[str, Any]:
         """List recent tasks, optionally filtered by node."""
         try:
-            tasks = []
-
             if node:
                 # Get tasks from specific node
-                node_tasks = self.proxmox.nodes(node).tasks.get(limit=limit)
-                if node_tasks is None:
-                    node_tasks = []
-                for task in node_tasks:
-                    task_info = {
-                        "upid": task.get("upid"),
-                        "node": task.get("node"),
-                        "pid": task.get("pid"),
-                        "pstart": task.get("pstart"),
-                        "type": task.get("type"),
-                        "status": task.get("status", "running"),
-                        "user": task.get("user"),
-                        "starttime": task.get("starttime", 0),
-                        "endtime": task.get("endtime", 0),
-                    }
-                    tasks.append(task_info)
+                raw = await self._run(self._node(node).tasks.get, limit=limit)
             else:
-                # Get tasks from all nodes
-                nodes = self.proxmox.nodes.get()
-                if nodes is None:
-                    nodes = []
-                for node_info in nodes:
-                    try:
-                        node_limit = limit // len(nodes) if len(nodes) > 0 else limit
-                        node_tasks = self.proxmox.nodes(node_info["node"]).tasks.get(
-                            limit=node_limit
-                        )
-                        if node_tasks is None:
-                            node_tasks = []
-                        for task in node_tasks:
-                            task_info = {
-                                "upid": task.get("upid"),
-                                "node": task.get("node"),
-                                "pid": task.get("pid"),
-                                "type": task.get("type"),
-                                "status": task.get("status", "running"),
-                                "user": task.get("user"),
-                                "starttime": task.get("starttime", 0),
-                                "endtime": task.get("endtime", 0),
-                            }
-                            tasks.append(task_info)
-                    except:
-                        continue
+                # cluster/tasks is already merged across nodes: one call, not N
+                raw = await self._run(self.proxmox.cluster.tasks.get)
+            tasks = [
+                {field: task.get(field, default) for field, default in _TASK_FIELDS}
+                for task in raw or ()
+            ]
 
-            # Sort by start time (most recent first)
-            tasks.sort(key=lambda x: x["starttime"], reverse=True)
+            # Keep the most recent tasks without sorting the whole list
+            tasks = heapq.nlargest(limit, tasks, key=itemgetter("starttime"))
 
-            return {"tasks": tasks[:limit], "count": len(tasks[:limit])}
+            return {"tasks": tasks, "count": len(tasks)}
 
         except Exception as e:
-            logger.error(f"Failed to list tasks: {e}")
+            logger.exception("Failed to list tasks")
             return {"error": str(e)}
 
     def get_cluster_log(self, max_lines: int = 50) -> Dict[str, Any]:
@@ -760,72 +1335,75 @@ class ProxmoxManager:
             return {"logs": formatted_logs, "count": len(formatted_logs)}
 
         except Exception as e:
-            logger.error(f"Failed to get cluster log: {e}")
+            logger.exception("Failed to get cluster log")
             return {"error": str(e)}
 
     # Template management
     def list_templates(self) -> Dict[str, Any]:
         """List all available templates (VMs and containers marked as templates)."""
         try:
-            templates = []
-            nodes = self.proxmox.nodes.get()
-            if nodes is None:
-                nodes = []
-
-            for node in nodes:
-                node_name = node["node"]
-
-                # Check VMs for templates
-                vms = self.proxmox.nodes(node_name).qemu.get()
-                if vms:
-                    for vm in vms:
-                        if vm.get("template", 0) == 1:
-                            template_info = {
-                                "vmid": vm["vmid"],
-                                "name": vm.get("name", "unnamed"),
-                                "node": node_name,
-                                "type": "qemu",
-                                "disk_size": vm.get("maxdisk", 0),
-                                "memory": vm.get("maxmem", 0),
-                                "cpus": vm.get("cpus", 1),
-                            }
-                            templates.append(template_info)
-
-                # Check containers for templates
-                containers = self.proxmox.nodes(node_name).lxc.get()
-                if containers:
-                    for ct in containers:
-                        if ct.get("template", 0) == 1:
-                            template_info = {
-                                "vmid": ct["vmid"],
-                                "name": ct.get("name", "unnamed"),
-                                "node": node_name,
-                                "type": "lxc",
-                                "disk_size": ct.get("maxdisk", 0),
-                                "memory": ct.get("maxmem", 0),
-                                "cpus": ct.get("cpus", 1),
-                            }
-                            templates.append(template_info)
+            # cluster/resources already carries every guest with its template flag
+            templates = [
+                TemplateInfo(
+                    guest["vmid"],
+                    guest.get("name", "unnamed"),
+                    guest["node"],
+                    guest["type"],
+                    guest.get("maxdisk", 0),
+                    guest.get("maxmem", 0),
+                    guest.get("maxcpu", 1),
+                )
+                for guest in self._guests()
+                if guest.get("template", 0) == 1
+            ]
 
             return {"templates": templates, "count": len(templates)}
 
         except Exception as e:
-            logger.error(f"Failed to list templates: {e}")
+            logger.exception("Failed to list templates")
             return {"error": str(e)}
 
     # Network & Firewall operations
+    def _agent_network(
+        self, node: str, vmid: int, agent_option: Any
+    ) -> Optional[List[Any]]:
+        """Guest-agent interface list, or None when the agent is unavailable.
+
+        VMs without the agent option are skipped outright, and a VM whose
+        agent failed to answer is not probed again for _AGENT_TTL seconds.
+        """
+        if not _agent_enabled(agent_option):
+            return None
+        key = (node, vmid)
+        down_until = self._agent_down.get(key)
+        if down_until is not None:
+            if down_until > time.monotonic():
+                return None
+            self._agent_down.pop(key, None)
+
+        try:
+            agent_info = self._qemu(node, vmid).agent.get("network-get-interfaces")
+        except Exception:
+            now = time.monotonic()
+            with self._agent_lock:
+                if key not in self._agent_down:
+                    _make_room(self._agent_down, float, now)
+                self._agent_down[key] = now + _AGENT_TTL
+            return None
+        return agent_info.get("result", []) if agent_info else None
+
     def get_vm_network(
         self, node: str, vmid: int, vm_type: str = "qemu"
     ) -> Dict[str, Any]:
         """Get network configuration for a VM or container."""
         try:
             if vm_type == "qemu":
-                config = self.proxmox.nodes(node).qemu(vmid).config.get()
+                config = self._qemu(node, vmid).config.get()
             else:
-                config = self.proxmox.nodes(node).lxc(vmid).config.get()
+                config = self._lxc(node, vmid).config.get()
 
             if config is None:
-                config = {}
+                config = _EMPTY
 
             network_info = {
                 "vmid": vmid,
@@ -834,691 +1412,522 @@ class ProxmoxManager:
                 "interfaces": [],
             }
 
-            # Extract network interfaces
-            for key in config:
-                if key.startswith("net"):
-                    net_config = config[key]
-                    interface = {"name": key, "config": net_config}
+            # Extract network interfaces (net0, net1, ...)
+            for key, net_config in config.items():
+                if key[:3] != "net" or not key[3:].isdigit():
+                    continue
+                interface = {"name": key, "config": net_config}
 
-                    # Parse network configuration string
-                    if isinstance(net_config, str):
-                        parts = net_config.split(",")
-                        for part in parts:
-                            if "=" in part:
-                                k, v = part.split("=", 1)
-                                interface[k] = v
+                # Parse the "model=MAC,bridge=vmbr0,..." option string
+                if isinstance(net_config, str):
+                    for k, v in _NET_OPTION.findall(net_config):
+                        interface[sys.intern(k)] = v
 
-                    network_info["interfaces"].append(interface)
+                network_info["interfaces"].append(interface)
 
             # Try to get IP addresses if agent is running (VMs only)
             if vm_type == "qemu":
-                try:
-                    agent_info = (
-                        self.proxmox.nodes(node)
-                        .qemu(vmid)
-                        .agent.get("network-get-interfaces")
-                    )
-                    if agent_info:
-                        network_info["agent_network"] = agent_info.get("result", [])
-                    else:
-                        network_info["agent_network"] = None
-                except:
-                    network_info["agent_network"] = None
+                network_info["agent_network"] = self._agent_network(
+                    node, vmid, config.get("agent")
+                )
 
             return network_info
 
         except Exception as e:
-            logger.error(f"Failed to get network info: {e}")
+            logger.exception("Failed to get network info")
             return {"error": str(e)}
 
+    def _firewall_view(self, node: str, vmid: Optional[int]) -> "FirewallView":
+        """Fetch the firewall options and rules for a node or VM."""
+        if vmid:
+            # Get VM firewall status
+            firewall = self._qemu(node, vmid).firewall
+        else:
+            # Get node firewall status
+            firewall = self._node(node).firewall
+        options = firewall.options.get() or _EMPTY
+        rules = firewall.rules.get() or ()
+        return FirewallView.build(
+            f"VM {vmid}" if vmid else f"Node {node}", options, rules
+        )
+
     def get_firewall_status(
-        self, node: str, vmid: Optional[int] = None
+        self, node: str, vmid: Optional[int] = None, direction: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get firewall status and rules for a node or VM."""
-        try:
-            if vmid:
-                # Get VM firewall status
-                options = self.proxmox.nodes(node).qemu(vmid).firewall.options.get()
-                rules = self.proxmox.nodes(node).qemu(vmid).firewall.rules.get()
-            else:
-                # Get node firewall status
-                options = self.proxmox.nodes(node).firewall.options.get()
-                rules = self.proxmox.nodes(node).firewall.rules.get()
-
-            if options is None:
-                options = {}
-            if rules is None:
-                rules = []
-
-            firewall_info = {
-                "target": f"VM {vmid}" if vmid else f"Node {node}",
-                "enabled": options.get("enable", 0),
-                "policy_in": options.get("policy_in", "ACCEPT"),
-                "policy_out": options.get("policy_out", "ACCEPT"),
-                "log_level": options.get("log_level_in", "nolog"),
-                "rules": [],
-            }
+        """Get firewall status and rules for a node or VM.
 
-            for rule in rules:
-                rule_info = {
-                    "pos": rule.get("pos"),
-                    "type": rule.get("type"),
-                    "action": rule.get("action"),
-                    "enable": rule.get("enable", 1),
-                    "source": rule.get("source", "any"),
-                    "dest": rule.get("dest", "any"),
-                    "proto": rule.get("proto", "any"),
-                    "dport": rule.get("dport", ""),
-                    "sport": rule.get("sport", ""),
-                    "comment": rule.get("comment", ""),
-                }
-                firewall_info["rules"].append(rule_info)
-
-            return firewall_info
+        direction limits the rules to the enabled ones for "in" or "out".
+        """
+        try:
+            view = self._cache.get(
+                f"fw:{node}:{vmid}",
+                _FIREWALL_TTL,
+                lambda: self._firewall_view(node, vmid),
+            )
+            return view.to_dict(direction)
 
         except Exception as e:
-            logger.error(f"Failed to get firewall status: {e}")
+            logger.exception("Failed to get firewall status")
             return {"error": str(e)}
 
 
-async def run_mcp_server():
-    """Run the MCP server with stdio transport."""
-    # Initialize Proxmox manager - but handle errors gracefully
-    proxmox = None
-    initialization_error = None
-
-    try:
-        proxmox = ProxmoxManager()
-        logger.info("Successfully initialized Proxmox connection")
-    except Exception as e:
-        logger.error(f"Failed to initialize Proxmox connection: {e}")
-        initialization_error = str(e)
-        # Don't exit - let the MCP server run and report the error through the protocol
-
-    # Create MCP server
-    server = Server("ProxmoxMCP")
-
-    @server.list_tools()
-    async def list_tools() -> List[Tool]:
-        """List available MCP tools."""
-        return [
-            Tool(
-                name="get_nodes",
-                description="List all nodes in the Proxmox cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
+def _schema(*required: str, **properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Object inputSchema with the given properties, in order."""
+    return {"type": "object", "properties": properties, "required": list(required)}
+
+
+# Property fragments shared between tool schemas; consumers only read them
+_NODE = {"type": "string", "description": "Node name"}
+_VM_NODE = {
+    "type": "string",
+    "description": "Node name where VM is located (looked up from vmid if omitted)",
+}
+_CT_NODE = {
+    "type": "string",
+    "description": "Node name where container is located (looked up from vmid if omitted)",
+}
+_VM_ID = {"type": "integer", "description": "VM ID number"}
+_CT_ID = {"type": "integer", "description": "Container ID number"}
+_BULK_VMIDS = {
+    "type": "array",
+    "items": {"type": "integer"},
+    "minItems": 1,
+    "description": "Optional VM IDs to limit the operation to",
+}
+_SNAPSHOT_NAME = {"type": "string", "description": "Snapshot name"}
+_SNAPSHOT_DESCRIPTION = {
+    "type": "string",
+    "description": "Optional snapshot description",
+}
+
+_NO_ARGS = _schema()
+_VM_ARGS = _schema("vmid", node=_VM_NODE, vmid=_VM_ID)
+_CT_ARGS = _schema("vmid", node=_CT_NODE, vmid=_CT_ID)
+_BULK_ARGS = _schema("node", node=_NODE, vmids=_BULK_VMIDS)
+
+# Static tool catalogue as (name, description, inputSchema), built once at
+# import and shared by every tools/list
+_TOOLS: Tuple[Tool, ...] = tuple(
+    Tool(name=name, description=description, inputSchema=schema)
+    for name, description, schema in (
+        ("get_nodes", "List all nodes in the Proxmox cluster", _NO_ARGS),
+        (
+            "get_node_status",
+            "Get detailed status for a specific node",
+            _schema(
+                "node",
+                node={"type": "string", "description": "Node name (e.g., 'pve1')"},
             ),
-            Tool(
-                name="get_node_status",
-                description="Get detailed status for a specific node",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name (e.g., 'pve1')",
-                        }
-                    },
-                    "required": ["node"],
-                },
-            ),
-            Tool(
-                name="get_vms",
-                description="List all VMs across the cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_containers",
-                description="List all LXC containers across the cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_vm_status",
-                description="Get status and configuration for a specific VM",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                    },
-                    "required": ["node", "vmid"],
-                },
-            ),
-            Tool(
-                name="get_container_status",
-                description="Get status and configuration for a specific container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                    },
-                    "required": ["node", "vmid"],
+        ),
+        ("get_vms", "List all VMs across the cluster", _NO_ARGS),
+        (
+            "get_vms_with_status",
+            "List all VMs across the cluster with each VM's current status",
+            _NO_ARGS,
+        ),
+        ("get_containers", "List all LXC containers across the cluster", _NO_ARGS),
+        ("get_vm_status", "Get status and configuration for a specific VM", _VM_ARGS),
+        (
+            "get_container_status",
+            "Get status and configuration for a specific container",
+            _CT_ARGS,
+        ),
+        ("start_vm", "Start a virtual machine", _VM_ARGS),
+        ("stop_vm", "Stop a virtual machine gracefully", _VM_ARGS),
+        ("reboot_vm", "Reboot a virtual machine", _VM_ARGS),
+        (
+            "bulk_start_vms",
+            "Start all guests on a node, or only the listed VM IDs, in one request",
+            _BULK_ARGS,
+        ),
+        (
+            "bulk_stop_vms",
+            "Stop all guests on a node, or only the listed VM IDs, in one request",
+            _BULK_ARGS,
+        ),
+        (
+            "bulk_reboot_vms",
+            "Reboot several virtual machines on a node",
+            _schema(
+                "node",
+                "vmids",
+                node=_NODE,
+                vmids={
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "minItems": 1,
+                    "description": "VM IDs to reboot",
                 },
             ),
-            Tool(
-                name="start_vm",
-                description="Start a virtual machine",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                    },
-                    "required": ["node", "vmid"],
+        ),
+        ("start_container", "Start an LXC container", _CT_ARGS),
+        ("stop_container", "Stop an LXC container gracefully", _CT_ARGS),
+        ("reboot_container", "Reboot an LXC container", _CT_ARGS),
+        (
+            "execute_vm_command",
+            "Execute a command in a VM via QEMU guest agent",
+            _schema(
+                "vmid",
+                "command",
+                node=_VM_NODE,
+                vmid=_VM_ID,
+                command={
+                    "type": "string",
+                    "description": "Command to execute in the VM",
                 },
             ),
-            Tool(
-                name="stop_vm",
-                description="Stop a virtual machine gracefully",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                    },
-                    "required": ["node", "vmid"],
-                },
+        ),
+        (
+            "create_vm_snapshot",
+            "Create a snapshot of a VM",
+            _schema(
+                "vmid",
+                "name",
+                node=_VM_NODE,
+                vmid=_VM_ID,
+                name=_SNAPSHOT_NAME,
+                description=_SNAPSHOT_DESCRIPTION,
             ),
-            Tool(
-                name="reboot_vm",
-                description="Reboot a virtual machine",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                    },
-                    "required": ["node", "vmid"],
+        ),
+        ("list_vm_snapshots", "List all snapshots for a VM", _VM_ARGS),
+        (
+            "execute_container_command",
+            "Execute a command in a container",
+            _schema(
+                "vmid",
+                "command",
+                node=_CT_NODE,
+                vmid=_CT_ID,
+                command={
+                    "type": "string",
+                    "description": "Command to execute in the container",
                 },
             ),
-            Tool(
-                name="start_container",
-                description="Start an LXC container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                    },
-                    "required": ["node", "vmid"],
-                },
-            ),
-            Tool(
-                name="stop_container",
-                description="Stop an LXC container gracefully",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                    },
-                    "required": ["node", "vmid"],
-                },
+        ),
+        (
+            "create_container_snapshot",
+            "Create a snapshot of a container",
+            _schema(
+                "vmid",
+                "name",
+                node=_CT_NODE,
+                vmid=_CT_ID,
+                name=_SNAPSHOT_NAME,
+                description=_SNAPSHOT_DESCRIPTION,
             ),
-            Tool(
-                name="reboot_container",
-                description="Reboot an LXC container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                    },
-                    "required": ["node", "vmid"],
-                },
+        ),
+        ("list_container_snapshots", "List all snapshots for a container", _CT_ARGS),
+        ("get_storage", "List storage pools in the cluster", _NO_ARGS),
+        (
+            "get_storage_details",
+            "Get detailed information about a specific storage pool",
+            _schema(
+                "storage",
+                storage={"type": "string", "description": "Storage pool name"},
             ),
-            Tool(
-                name="execute_vm_command",
-                description="Execute a command in a VM via QEMU guest agent",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                        "command": {
-                            "type": "string",
-                            "description": "Command to execute in the VM",
-                        },
-                    },
-                    "required": ["node", "vmid", "command"],
+        ),
+        (
+            "get_backups",
+            "List backup files in storage",
+            _schema(
+                storage={
+                    "type": "string",
+                    "description": "Optional: specific storage pool",
                 },
+                node={"type": "string", "description": "Optional: specific node"},
             ),
-            Tool(
-                name="create_vm_snapshot",
-                description="Create a snapshot of a VM",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                        "name": {"type": "string", "description": "Snapshot name"},
-                        "description": {
-                            "type": "string",
-                            "description": "Optional snapshot description",
-                        },
-                    },
-                    "required": ["node", "vmid", "name"],
+        ),
+        ("get_cluster_status", "Get cluster status and health information", _NO_ARGS),
+        (
+            "get_task_status",
+            "Get status of a Proxmox task",
+            _schema(
+                "node",
+                "upid",
+                node={
+                    "type": "string",
+                    "description": "Node where the task is running",
                 },
+                upid={"type": "string", "description": "Unique Process ID of the task"},
             ),
-            Tool(
-                name="list_vm_snapshots",
-                description="List all snapshots for a VM",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM is located",
-                        },
-                        "vmid": {"type": "integer", "description": "VM ID number"},
-                    },
-                    "required": ["node", "vmid"],
+        ),
+        ("get_users", "List all users in the Proxmox cluster", _NO_ARGS),
+        ("get_groups", "List all groups in the Proxmox cluster", _NO_ARGS),
+        ("get_roles", "List all roles available in the Proxmox cluster", _NO_ARGS),
+        (
+            "get_vm_network",
+            "Get network configuration for a VM or container",
+            _schema(
+                "vmid",
+                node={
+                    "type": "string",
+                    "description": "Node name where VM/container is located (looked up from vmid if omitted)",
                 },
-            ),
-            Tool(
-                name="execute_container_command",
-                description="Execute a command in a container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                        "command": {
-                            "type": "string",
-                            "description": "Command to execute in the container",
-                        },
-                    },
-                    "required": ["node", "vmid", "command"],
+                vmid={"type": "integer", "description": "VM or container ID"},
+                vm_type={
+                    "type": "string",
+                    "description": "Type: 'qemu' for VM, 'lxc' for container (default: qemu)",
                 },
             ),
-            Tool(
-                name="create_container_snapshot",
-                description="Create a snapshot of a container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                        "name": {"type": "string", "description": "Snapshot name"},
-                        "description": {
-                            "type": "string",
-                            "description": "Optional snapshot description",
-                        },
-                    },
-                    "required": ["node", "vmid", "name"],
+        ),
+        (
+            "get_firewall_status",
+            "Get firewall status and rules for a node or VM",
+            _schema(
+                "node",
+                node=_NODE,
+                vmid={
+                    "type": "integer",
+                    "description": "Optional: VM ID (if checking VM firewall)",
                 },
-            ),
-            Tool(
-                name="list_container_snapshots",
-                description="List all snapshots for a container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Container ID number",
-                        },
-                    },
-                    "required": ["node", "vmid"],
+                direction={
+                    "type": "string",
+                    "enum": ["in", "out"],
+                    "description": "Optional: only list enabled rules for this direction",
                 },
             ),
-            Tool(
-                name="get_storage",
-                description="List storage pools in the cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_storage_details",
-                description="Get detailed information about a specific storage pool",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "storage": {
-                            "type": "string",
-                            "description": "Storage pool name",
-                        }
-                    },
-                    "required": ["storage"],
+        ),
+        (
+            "get_recent_tasks",
+            "List recent tasks across the cluster",
+            _schema(
+                node={
+                    "type": "string",
+                    "description": "Optional: filter tasks by specific node",
                 },
-            ),
-            Tool(
-                name="get_backups",
-                description="List backup files in storage",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "storage": {
-                            "type": "string",
-                            "description": "Optional: specific storage pool",
-                        },
-                        "node": {
-                            "type": "string",
-                            "description": "Optional: specific node",
-                        },
-                    },
-                    "required": [],
+                limit={
+                    "type": "integer",
+                    "description": "Maximum number of tasks to return (default: 20)",
                 },
             ),
-            Tool(
-                name="get_cluster_status",
-                description="Get cluster status and health information",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_task_status",
-                description="Get status of a Proxmox task",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node where the task is running",
-                        },
-                        "upid": {
-                            "type": "string",
-                            "description": "Unique Process ID of the task",
-                        },
-                    },
-                    "required": ["node", "upid"],
-                },
-            ),
-            Tool(
-                name="get_users",
-                description="List all users in the Proxmox cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_groups",
-                description="List all groups in the Proxmox cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_roles",
-                description="List all roles available in the Proxmox cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
-            ),
-            Tool(
-                name="get_vm_network",
-                description="Get network configuration for a VM or container",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name where VM/container is located",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "VM or container ID",
-                        },
-                        "vm_type": {
-                            "type": "string",
-                            "description": "Type: 'qemu' for VM, 'lxc' for container (default: qemu)",
-                        },
-                    },
-                    "required": ["node", "vmid"],
-                },
-            ),
-            Tool(
-                name="get_firewall_status",
-                description="Get firewall status and rules for a node or VM",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Node name",
-                        },
-                        "vmid": {
-                            "type": "integer",
-                            "description": "Optional: VM ID (if checking VM firewall)",
-                        },
-                    },
-                    "required": ["node"],
-                },
-            ),
-            Tool(
-                name="get_recent_tasks",
-                description="List recent tasks across the cluster",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "node": {
-                            "type": "string",
-                            "description": "Optional: filter tasks by specific node",
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum number of tasks to return (default: 20)",
-                        },
-                    },
-                    "required": [],
-                },
-            ),
-            Tool(
-                name="get_cluster_log",
-                description="Get recent cluster log entries",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "max_lines": {
-                            "type": "integer",
-                            "description": "Maximum number of log entries to return (default: 50)",
-                        },
-                    },
-                    "required": [],
-                },
-            ),
-            Tool(
-                name="list_templates",
-                description="List all VM and container templates available in the cluster",
-                inputSchema={"type": "object", "properties": {}, "required": []},
+        ),
+        (
+            "get_cluster_log",
+            "Get recent cluster log entries",
+            _schema(
+                max_lines={
+                    "type": "integer",
+                    "description": "Maximum number of log entries to return (default: 50)",
+                }
             ),
-        ]
+        ),
+        (
+            "list_templates",
+            "List all VM and container templates available in the cluster",
+            _NO_ARGS,
+        ),
+    )
+)
 
-    @server.call_tool()
-    async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+
+# inputSchema validators compiled once; mcp's built-in check re-validates the
+# schema itself on every call, so call_tool validates with these instead
+_VALIDATORS = {tool.name: Draft202012Validator(tool.inputSchema) for tool in _TOOLS}
+_REQUIRED_ARGS = {tool.name: tuple(tool.inputSchema["required"]) for tool in _TOOLS}
+
+
+def _progress_reporter() -> Optional[ProgressCallback]:
+    """Build a progress callback if the current request carries a progressToken."""
+    ctx = request_ctx.get(None)
+    token = ctx.meta.progressToken if ctx and ctx.meta else None
+    if token is None:
+        return None
+
+    async def report(completed: int, total: int, message: str) -> None:
+        try:
+            await ctx.session.send_progress_notification(
+                token,
+                completed,
+                total,
+                message,
+                related_request_id=str(ctx.request_id),
+            )
+        except Exception:
+            # Progress is best-effort and must not fail the tool call
+            logger.debug("Failed to send progress notification", exc_info=True)
+
+    return report
+
+
+def _guest_node(proxmox: ProxmoxManager, arguments: Dict[str, Any]) -> str:
+    """Node argument of a per-guest tool, resolved from vmid when omitted."""
+    return arguments.get("node") or proxmox.find_node(arguments["vmid"])
+
+
+# Tool name -> handler(manager, arguments) for blocking manager methods; these
+# run in the manager's worker threads
+_DISPATCH: Dict[str, Callable[[ProxmoxManager, Dict[str, Any]], Any]] = {
+    "get_nodes": lambda p, a: p.get_nodes(),
+    "get_node_status": lambda p, a: p.get_node_status(a["node"]),
+    "get_vm_status": lambda p, a: p.get_vm_status(_guest_node(p, a), a["vmid"]),
+    "get_container_status": lambda p, a: p.get_container_status(
+        _guest_node(p, a), a["vmid"]
+    ),
+    "start_vm": lambda p, a: p.start_vm(_guest_node(p, a), a["vmid"]),
+    "stop_vm": lambda p, a: p.stop_vm(_guest_node(p, a), a["vmid"]),
+    "reboot_vm": lambda p, a: p.reboot_vm(_guest_node(p, a), a["vmid"]),
+    "bulk_start_vms": lambda p, a: p.bulk_start_vms(a["node"], a.get("vmids")),
+    "bulk_stop_vms": lambda p, a: p.bulk_stop_vms(a["node"], a.get("vmids")),
+    "start_container": lambda p, a: p.start_container(_guest_node(p, a), a["vmid"]),
+    "stop_container": lambda p, a: p.stop_container(_guest_node(p, a), a["vmid"]),
+    "reboot_container": lambda p, a: p.reboot_container(_guest_node(p, a), a["vmid"]),
+    "execute_vm_command": lambda p, a: p.execute_vm_command(
+        _guest_node(p, a), a["vmid"], a["command"]
+    ),
+    "execute_container_command": lambda p, a: p.execute_container_command(
+        _guest_node(p, a), a["vmid"], a["command"]
+    ),
+    "create_vm_snapshot": lambda p, a: p.create_vm_snapshot(
+        _guest_node(p, a), a["vmid"], a["name"], a.get("description")
+    ),
+    "create_container_snapshot": lambda p, a: p.create_container_snapshot(
+        _guest_node(p, a), a["vmid"], a["name"], a.get("description")
+    ),
+    "list_vm_snapshots": lambda p, a: p.list_vm_snapshots(_guest_node(p, a), a["vmid"]),
+    "list_container_snapshots": lambda p, a: p.list_container_snapshots(
+        _guest_node(p, a), a["vmid"]
+    ),
+    "get_storage": lambda p, a: p.get_storage(),
+    "get_task_status": lambda p, a: p.get_task_status(a["node"], a["upid"]),
+    "get_users": lambda p, a: p.get_users(),
+    "get_groups": lambda p, a: p.get_groups(),
+    "get_roles": lambda p, a: p.get_roles(),
+    "get_vm_network": lambda p, a: p.get_vm_network(
+        _guest_node(p, a), a["vmid"], a.get("vm_type", "qemu")
+    ),
+    "get_firewall_status": lambda p, a: p.get_firewall_status(
+        a["node"], a.get("vmid"), a.get("direction")
+    ),
+    "get_cluster_log": lambda p, a: p.get_cluster_log(a.get("max_lines", 50)),
+    "list_templates": lambda p, a: p.list_templates(),
+}
+
+# Tool name -> handler(manager, arguments) returning a coroutine; these run on
+# the event loop and only send their own API calls to the worker threads
+_ASYNC_DISPATCH: Dict[
+    str, Callable[[ProxmoxManager, Dict[str, Any]], Awaitable[Any]]
+] = {
+    "get_vms": lambda p, a: p.get_vms(),
+    "get_vms_with_status": lambda p, a: p.get_vms_with_status(),
+    "get_containers": lambda p, a: p.get_containers(),
+    "bulk_reboot_vms": lambda p, a: p.bulk_reboot_vms(a["node"], a["vmids"]),
+    "get_storage_details": lambda p, a: p.get_storage_details(a["storage"]),
+    "get_backups": lambda p, a: p.get_backups(
+        a.get("storage"), a.get("node"), progress=_progress_reporter()
+    ),
+    "get_cluster_status": lambda p, a: p.get_cluster_status(),
+    "get_recent_tasks": lambda p, a: p.get_recent_tasks(
+        a.get("node"), a.get("limit", 20)
+    ),
+}
+
+
+def create_server(
+    proxmox: Optional[ProxmoxManager], initialization_error: Optional[str] = None
+) -> Server:
+    """Build the MCP server; without a manager every tool reports the init error."""
+    # The degraded-mode reply never changes, so it is serialized only once
+    init_error_reply = None
+    if proxmox is None:
+        error_msg = initialization_error or "Proxmox connection not initialized"
+        init_error_reply = _reply(
+            {
+                "error": f"Server initialization failed: {error_msg}",
+                "details": "Please check environment variables and server configuration",
+            }
+        )
+
+    server = Server("ProxmoxMCP")
+
+    @server.list_tools()
+    async def list_tools() -> List[Tool]:
+        """List available MCP tools."""
+        return list(_TOOLS)
+
+    @server.call_tool(validate_input=False)
+    async def call_tool(
+        name: str, arguments: Dict[str, Any]
+    ) -> Union[List[TextContent], CallToolResult]:
         """Handle MCP tool calls."""
+        # Report every missing argument at once before the full schema check
+        missing = [key for key in _REQUIRED_ARGS.get(name, ()) if key not in arguments]
+        if missing:
+            return _input_error(f"missing required arguments: {', '.join(missing)}")
+
+        validator = _VALIDATORS.get(name)
+        if validator is not None:
+            error = best_match(validator.iter_errors(arguments))
+            if error is not None:
+                return _input_error(error.message)
+
         try:
             # Check if initialization failed
             if proxmox is None:
-                error_msg = initialization_error or "Proxmox connection not initialized"
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "error": f"Server initialization failed: {error_msg}",
-                                "details": "Please check environment variables and server configuration",
-                            },
-                            indent=2,
-                        ),
-                    )
-                ]
-
-            result = None
-
-            # Route tool calls to appropriate methods
-            if name == "get_nodes":
-                result = proxmox.get_nodes()
-            elif name == "get_node_status":
-                result = proxmox.get_node_status(arguments["node"])
-            elif name == "get_vms":
-                result = proxmox.get_vms()
-            elif name == "get_containers":
-                result = proxmox.get_containers()
-            elif name == "get_vm_status":
-                result = proxmox.get_vm_status(arguments["node"], arguments["vmid"])
-            elif name == "get_container_status":
-                result = proxmox.get_container_status(
-                    arguments["node"], arguments["vmid"]
-                )
-            elif name == "start_vm":
-                result = proxmox.start_vm(arguments["node"], arguments["vmid"])
-            elif name == "stop_vm":
-                result = proxmox.stop_vm(arguments["node"], arguments["vmid"])
-            elif name == "reboot_vm":
-                result = proxmox.reboot_vm(arguments["node"], arguments["vmid"])
-            elif name == "start_container":
-                result = proxmox.start_container(arguments["node"], arguments["vmid"])
-            elif name == "stop_container":
-                result = proxmox.stop_container(arguments["node"], arguments["vmid"])
-            elif name == "reboot_container":
-                result = proxmox.reboot_container(arguments["node"], arguments["vmid"])
-            elif name == "execute_vm_command":
-                result = proxmox.execute_vm_command(
-                    arguments["node"], arguments["vmid"], arguments["command"]
-                )
-            elif name == "execute_container_command":
-                result = proxmox.execute_container_command(
-                    arguments["node"], arguments["vmid"], arguments["command"]
-                )
-            elif name == "create_vm_snapshot":
-                result = proxmox.create_vm_snapshot(
-                    arguments["node"],
-                    arguments["vmid"],
-                    arguments["name"],
-                    arguments.get("description"),
-                )
-            elif name == "create_container_snapshot":
-                result = proxmox.create_container_snapshot(
-                    arguments["node"],
-                    arguments["vmid"],
-                    arguments["name"],
-                    arguments.get("description"),
-                )
-            elif name == "list_vm_snapshots":
-                result = proxmox.list_vm_snapshots(arguments["node"], arguments["vmid"])
-            elif name == "list_container_snapshots":
-                result = proxmox.list_container_snapshots(
-                    arguments["node"], arguments["vmid"]
-                )
-            elif name == "get_storage":
-                result = proxmox.get_storage()
-            elif name == "get_storage_details":
-                result = proxmox.get_storage_details(arguments["storage"])
-            elif name == "get_backups":
-                result = proxmox.get_backups(
-                    arguments.get("storage"), arguments.get("node")
-                )
-            elif name == "get_cluster_status":
-                result = proxmox.get_cluster_status()
-            elif name == "get_task_status":
-                result = proxmox.get_task_status(arguments["node"], arguments["upid"])
-            elif name == "get_users":
-                result = proxmox.get_users()
-            elif name == "get_groups":
-                result = proxmox.get_groups()
-            elif name == "get_roles":
-                result = proxmox.get_roles()
-            elif name == "get_vm_network":
-                result = proxmox.get_vm_network(
-                    arguments["node"],
-                    arguments["vmid"],
-                    arguments.get("vm_type", "qemu"),
-                )
-            elif name == "get_firewall_status":
-                result = proxmox.get_firewall_status(
-                    arguments["node"], arguments.get("vmid")
-                )
-            elif name == "get_recent_tasks":
-                result = proxmox.get_recent_tasks(
-                    arguments.get("node"), arguments.get("limit", 20)
-                )
-            elif name == "get_cluster_log":
-                result = proxmox.get_cluster_log(arguments.get("max_lines", 50))
-            elif name == "list_templates":
-                result = proxmox.list_templates()
-            else:
-                result = {"error": f"Unknown tool: {name}"}
+                return init_error_reply
 
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return _reply(await proxmox.dispatch(name, arguments))
         except Exception as e:
-            logger.error(f"Error calling tool {name}: {e}")
-            return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+            logger.error("Error calling tool %s: %s", name, e)
+            return _reply({"error": str(e)})
+
+    return server
+
+
+async def run_mcp_server():
+    """Run the MCP server with stdio transport."""
+    # Initialize Proxmox manager - but handle errors gracefully
+    proxmox = None
+    initialization_error = None
+
+    try:
+        proxmox = ProxmoxManager()
+        logger.info("Successfully initialized Proxmox connection")
+    except Exception as e:
+        logger.error("Failed to initialize Proxmox connection: %s", e)
+        initialization_error = str(e)
+        # Don't exit - let the MCP server run and report the error through the protocol
+
+    server = create_server(proxmox, initialization_error)
 
     # Run the server with stdio transport
     logger.info("Starting Proxmox MCP Server (STDIO)...")
     if proxmox:
-        logger.info(f"Connected to Proxmox host: {os.getenv('PROXMOX_HOST')}")
+        logger.info("Connected to Proxmox host: %s", proxmox.config.host)
     else:
         logger.warning("Running in degraded mode - Proxmox connection failed")
 
     # Use stdio_server for MCP communication
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options(),
+            )
+    finally:
+        if proxmox:
+            proxmox.close()
+
+
+def _init_runtime():
+    """Process-wide setup, kept out of import so tooling can load the module."""
+    # Log to stderr so it doesn't interfere with stdio communication
+    logging.basicConfig(
+        level=_env_get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
 
 
 def main():
     """Main entry point."""
+    _init_runtime()
+
     # Check for required environment variables
-    required_vars = ["PROXMOX_HOST", "PROXMOX_TOKEN_ID", "PROXMOX_TOKEN_SECRET"]
-    missing = [var for var in required_vars if not os.getenv(var)]
+    missing = [keys[0] for keys in _ENV_ALIASES.values() if not _first_env(*keys)]
 
     if missing:
-        logger.error(f"Missing required environment variables: {', '.join(missing)}")
+        logger.error("Missing required environment variables: %s", ", ".join(missing))
         logger.info("Please set the following environment variables:")
         logger.info(
             "  PROXMOX_HOST - Your Proxmox server address (e.g., 192.168.1.100)"
@@ -1532,12 +1941,21 @@ def main():
         # Don't exit immediately - run the server anyway to report errors through MCP protocol
         # The server will run in a degraded mode and report initialization errors
 
+    # uvloop's libuv loop moves the stdio JSON-RPC pipes faster; it is optional
+    # and not available on Windows, so fall back to the default loop
+    try:
+        import uvloop
+    except ImportError:
+        run = asyncio.run
+    else:
+        run = uvloop.run
+
     try:
-        asyncio.run(run_mcp_server())
+        run(run_mcp_server())
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         import traceback
 
         traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mcp_server_stdio  # noqa: E402
+
+
+class FakeResource:
+    """Stand-in for a proxmoxer resource path with canned replies."""
+
+    def __init__(self, api, path=()):
+        self._api = api
+        self._path = path
+
+    def __getattr__(self, name):
+        return FakeResource(self._api, self._path + (name,))
+
+    def __call__(self, *segments):
+        return FakeResource(self._api, self._path + tuple(map(str, segments)))
+
+    def _reply(self, path, params):
+        reply = self._api.routes[path]
+        if callable(reply):
+            reply = reply(params)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def get(self, *segments, **params):
+        path = "/".join(self._path + segments)
+        self._api.calls.append(path)
+        return self._reply(path, params)
+
+    def post(self, *segments, **params):
+        path = "/".join(self._path + segments)
+        self._api.posts.append((path, params))
+        return self._reply(path, params)
+
+
+class FakeProxmox(FakeResource):
+    """Fake ProxmoxAPI answering from a {path: reply} mapping.
+
+    A callable reply is called with the request parameters. GET paths are
+    recorded in calls, POSTs as (path, params) in posts.
+    """
+
+    def __init__(self, routes):
+        super().__init__(self)
+        self.routes = routes
+        self.calls = []
+        self.posts = []
+
+
+@pytest.fixture
+def make_manager(monkeypatch):
+    """Build a ProxmoxManager whose API is a FakeProxmox over the given routes."""
+    managers = []
+
+    def make(routes):
+        api = FakeProxmox(routes)
+        monkeypatch.setattr(
+            mcp_server_stdio.ProxmoxManager, "_connect", lambda self: api
+        )
+        config = mcp_server_stdio.ProxmoxConfig("pve", "root@pam", "t", "v", False)
+        manager = mcp_server_stdio.ProxmoxManager(config)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
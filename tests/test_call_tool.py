@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+import mcp_server_stdio as m
+
+
+def call(server, name, arguments):
+    """Send a tools/call request through the server's registered handler."""
+    handler = server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        method="tools/call",
+        params=CallToolRequestParams(name=name, arguments=arguments),
+    )
+    return asyncio.run(handler(request)).root
+
+
+def test_missing_arguments_are_listed_together():
+    result = call(m.create_server(None), "create_vm_snapshot", {})
+    assert result.isError
+    assert result.content[0].text == (
+        "Input validation error: missing required arguments: vmid, name"
+    )
+
+
+def test_wrong_argument_type_is_rejected():
+    result = call(m.create_server(None), "get_vm_status", {"vmid": "100"})
+    assert result.isError
+    assert result.content[0].text == (
+        "Input validation error: '100' is not of type 'integer'"
+    )
+
+
+def test_valid_arguments_reach_the_manager(make_manager):
+    manager = make_manager({"nodes/pve1/qemu/100/status/current": {"status": "ok"}})
+    result = call(
+        m.create_server(manager), "get_vm_status", {"node": "pve1", "vmid": 100}
+    )
+    assert not result.isError
+    assert json.loads(result.content[0].text) == {"status": "ok"}
+
+
+def test_degraded_mode_reports_init_error():
+    result = call(m.create_server(None, "bad token"), "get_nodes", {})
+    assert json.loads(result.content[0].text)["error"] == (
+        "Server initialization failed: bad token"
+    )
+
+
+def test_empty_bulk_selection_is_rejected():
+    result = call(m.create_server(None), "bulk_stop_vms", {"node": "pve1", "vmids": []})
+    assert result.isError
+    assert "should be non-empty" in result.content[0].text
@@ -0,0 +1,49 @@
+import pytest
+
+from mcp_server_stdio import ProxmoxConfig, _truthy
+
+
+@pytest.mark.parametrize(
+    "raw, host",
+    [
+        ("pve", "pve"),
+        ("pve:8006", "pve"),
+        ("https://pve:8006/", "pve"),
+        ("https://pve.example.com:8006/api2/json", "pve.example.com"),
+        ("[::1]:8006", "[::1]"),
+        ("https://[::1]:8006/", "[::1]"),
+        ("::1", "::1"),
+    ],
+)
+def test_normalize_host(raw, host):
+    assert ProxmoxConfig._normalize_host(raw) == host
+
+
+@pytest.mark.parametrize(
+    "settings, message",
+    [
+        ({"pool_size": 0}, "PROXMOX_POOL_SIZE must be at least 1"),
+        ({"max_concurrency": 0}, "PROXMOX_MAX_CONCURRENCY must be at least 1"),
+        ({"threads": 0}, "PROXMOX_THREADS must be at least 1"),
+        ({"threads": -4}, "PROXMOX_THREADS must be at least 1"),
+        ({"cache_ttl": -1.0}, "PROXMOX_CACHE_TTL must not be negative"),
+        ({"cache_ttl": float("nan")}, "PROXMOX_CACHE_TTL must not be negative"),
+    ],
+)
+def test_invalid_settings_are_rejected(settings, message):
+    with pytest.raises(ValueError, match=message):
+        ProxmoxConfig("pve", "root@pam", "t", "v", False, **settings)
+
+
+def test_zero_cache_ttl_is_allowed():
+    assert ProxmoxConfig("pve", "root@pam", "t", "v", False, cache_ttl=0).cache_ttl == 0
+
+
+@pytest.mark.parametrize("value", ["1", "true", "True", "YES", "on", "On", " ON "])
+def test_truthy_spellings(value):
+    assert _truthy(value)
+
+
+@pytest.mark.parametrize("value", ["", "0", "false", "off", "no", "enabled"])
+def test_falsy_spellings(value):
+    assert not _truthy(value)
@@ -0,0 +1,354 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import mcp_server_stdio as m
+
+GUESTS = [
+    {"type": "qemu", "node": "pve1", "vmid": 100},
+    {"type": "lxc", "node": "pve2", "vmid": 200},
+]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(m, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_cache_reuses_value_until_ttl(clock):
+    cache = m._Cache()
+    loads = []
+
+    def loader():
+        loads.append(clock[0])
+        return len(loads)
+
+    assert cache.get("k", 10.0, loader) == 1
+    clock[0] += 9.9
+    assert cache.get("k", 10.0, loader) == 1
+    clock[0] += 0.1
+    assert cache.get("k", 10.0, loader) == 2
+    assert len(loads) == 2
+
+
+def test_cache_remembers_failure_for_negative_ttl(clock):
+    cache = m._Cache()
+    calls = []
+
+    def failing():
+        calls.append(clock[0])
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        cache.get("k", 10.0, failing)
+    clock[0] += m._NEGATIVE_TTL - 0.1
+    with pytest.raises(RuntimeError):
+        cache.get("k", 10.0, failing)
+    assert len(calls) == 1
+
+    clock[0] += 0.1
+    assert cache.get("k", 10.0, lambda: "up") == "up"
+
+
+def test_cache_zero_ttl_disables_caching(clock):
+    cache = m._Cache()
+    calls = []
+
+    def failing():
+        calls.append(clock[0])
+        raise RuntimeError("down")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cache.get("k", 0, failing)
+    assert len(calls) == 2
+    assert cache.get("k", 0, lambda: "up") == "up"
+    assert cache._entries == {}
+
+
+def test_find_node(make_manager):
+    manager = make_manager({"cluster/resources": GUESTS})
+    assert manager.find_node(100) == "pve1"
+    assert manager.find_node(200) == "pve2"
+    assert manager.proxmox.calls == ["cluster/resources"]
+
+
+def test_find_node_unknown_vmid(make_manager):
+    manager = make_manager({"cluster/resources": GUESTS})
+    with pytest.raises(ValueError, match="Guest 999 not found"):
+        manager.find_node(999)
+
+
+def test_guest_node_fills_in_missing_node(make_manager):
+    manager = make_manager({"cluster/resources": GUESTS})
+    assert m._guest_node(manager, {"vmid": 200}) == "pve2"
+    assert m._guest_node(manager, {"vmid": 200, "node": "other"}) == "other"
+    assert manager.proxmox.calls == ["cluster/resources"]
+
+
+@pytest.mark.parametrize(
+    "vmids, params",
+    [
+        ([101, 102], {"force": 1, "vms": "101,102"}),
+        (None, {"force": 1}),
+    ],
+)
+def test_bulk_start_vms_params(make_manager, vmids, params):
+    manager = make_manager({"nodes/pve1/startall": "UPID:start"})
+    result = manager.bulk_start_vms("pve1", vmids)
+    assert result["task_id"] == "UPID:start"
+    assert manager.proxmox.posts == [("nodes/pve1/startall", params)]
+
+
+@pytest.mark.parametrize(
+    "vmids, params",
+    [([101, 102], {"vms": "101,102"}), (None, {})],
+)
+def test_bulk_stop_vms_params(make_manager, vmids, params):
+    manager = make_manager({"nodes/pve1/stopall": "UPID:stop"})
+    manager.bulk_stop_vms("pve1", vmids)
+    assert manager.proxmox.posts == [("nodes/pve1/stopall", params)]
+
+
+def test_bulk_power_rejects_empty_selection(make_manager):
+    manager = make_manager({"nodes/pve1/startall": "x", "nodes/pve1/stopall": "x"})
+    assert "error" in manager.bulk_start_vms("pve1", [])
+    assert "error" in manager.bulk_stop_vms("pve1", [])
+    assert manager.proxmox.posts == []
+
+
+def test_bulk_reboot_vms_reports_each_vm(make_manager):
+    manager = make_manager(
+        {
+            "nodes/pve1/qemu/101/status/reboot": "UPID:101",
+            "nodes/pve1/qemu/102/status/reboot": RuntimeError("VM 102 is locked"),
+        }
+    )
+    result = asyncio.run(manager.bulk_reboot_vms("pve1", [101, 102]))
+    first, second = result["results"]
+    assert first["vmid"] == 101 and first["task_id"] == "UPID:101"
+    assert second == {"vmid": 102, "error": "VM 102 is locked"}
+
+
+def test_bulk_reboot_vms_reports_scheduling_failure(make_manager):
+    manager = make_manager({})
+    manager.close()
+    result = asyncio.run(manager.bulk_reboot_vms("pve1", [101]))
+    assert result["results"][0]["vmid"] == 101
+    assert "error" in result["results"][0]
+
+
+def test_cache_evicts_expired_then_oldest(clock, monkeypatch):
+    monkeypatch.setattr(m, "_MAX_CACHE_ENTRIES", 3)
+    cache = m._Cache()
+    cache.get("short", 1.0, lambda: 0)
+    cache.get("a", 10.0, lambda: 1)
+    cache.get("b", 10.0, lambda: 2)
+    clock[0] += 2.0
+    cache.get("c", 10.0, lambda: 3)
+    assert list(cache._entries) == ["a", "b", "c"]
+    cache.get("d", 10.0, lambda: 4)
+    assert list(cache._entries) == ["b", "c", "d"]
+
+
+FIREWALL_RULES = [
+    {"pos": 0, "type": "in", "action": "ACCEPT", "enable": 1},
+    {"pos": 1, "type": "in", "action": "DROP", "enable": 0},
+    {"pos": 2, "type": "out", "action": "ACCEPT", "enable": 1},
+    {"pos": 3, "type": "out", "action": "REJECT", "enable": 0},
+]
+
+
+def test_firewall_view_direction():
+    view = m.FirewallView.build("Node pve1", {"enable": 1}, FIREWALL_RULES)
+    assert [rule["pos"] for rule in view.to_dict()["rules"]] == [0, 1, 2, 3]
+    assert [rule["pos"] for rule in view.to_dict("in")["rules"]] == [0]
+    assert [rule["pos"] for rule in view.to_dict("out")["rules"]] == [2]
+
+
+def test_get_firewall_status_direction(make_manager):
+    manager = make_manager(
+        {
+            "nodes/pve1/firewall/options": {"enable": 1},
+            "nodes/pve1/firewall/rules": FIREWALL_RULES,
+        }
+    )
+    result = manager.get_firewall_status("pve1", direction="out")
+    assert [(rule["pos"], rule["type"]) for rule in result["rules"]] == [(2, "out")]
+
+
+def test_firewall_direction_schema():
+    validator = m._VALIDATORS["get_firewall_status"]
+    assert validator.is_valid({"node": "pve1", "direction": "in"})
+    assert not validator.is_valid({"node": "pve1", "direction": "both"})
+
+
+AGENT_PATH = "nodes/pve1/qemu/100/agent/network-get-interfaces"
+
+
+def vm_network_routes(agent, agent_reply):
+    return {
+        "nodes/pve1/qemu/100/config": {
+            "net0": "virtio=AA:BB:CC:DD:EE:FF,bridge=vmbr0",
+            "agent": agent,
+        },
+        AGENT_PATH: agent_reply,
+    }
+
+
+def test_vm_network_skips_disabled_agent(make_manager):
+    manager = make_manager(vm_network_routes("enabled=0", {"result": []}))
+    result = manager.get_vm_network("pve1", 100)
+    assert result["agent_network"] is None
+    assert result["interfaces"][0]["bridge"] == "vmbr0"
+    assert AGENT_PATH not in manager.proxmox.calls
+
+
+def test_vm_network_skips_recently_failed_agent(make_manager, clock):
+    manager = make_manager(vm_network_routes("1", RuntimeError("agent not running")))
+    for _ in range(2):
+        result = manager.get_vm_network("pve1", 100)
+        assert result["agent_network"] is None
+        assert result["interfaces"][0]["virtio"] == "AA:BB:CC:DD:EE:FF"
+    assert manager.proxmox.calls.count(AGENT_PATH) == 1
+
+    manager.proxmox.routes[AGENT_PATH] = {"result": [{"name": "eth0"}]}
+    clock[0] += m._AGENT_TTL
+    assert manager.get_vm_network("pve1", 100)["agent_network"] == [{"name": "eth0"}]
+    assert manager._agent_down == {}
+
+
+TASKS = [
+    {"upid": "UPID:1", "node": "pve1", "starttime": 5, "pstart": 11},
+    {"upid": "UPID:2", "node": "pve1", "starttime": 9, "status": "OK"},
+    {"upid": "UPID:3", "node": "pve1", "starttime": 7},
+]
+
+
+@pytest.mark.parametrize("node", [None, "pve1"])
+def test_recent_tasks_shape(make_manager, node):
+    manager = make_manager({"cluster/tasks": TASKS, "nodes/pve1/tasks": TASKS})
+    result = asyncio.run(manager.get_recent_tasks(node, limit=2))
+    tasks = result["tasks"]
+    assert result["count"] == 2
+    assert [task["upid"] for task in tasks] == ["UPID:2", "UPID:3"]
+    for task in tasks:
+        assert tuple(task) == tuple(field for field, _ in m._TASK_FIELDS)
+    assert tasks[1]["status"] == "running"
+
+
+STORAGES = [
+    {"node": "pve1", "storage": "nfs", "shared": 1, "content": "backup"},
+    {"node": "pve2", "storage": "nfs", "shared": 1, "content": "backup"},
+    {"node": "pve1", "storage": "local", "shared": 0, "content": "iso,backup"},
+    {"node": "pve2", "storage": "local", "shared": 0, "content": "iso,backup"},
+    {"node": "pve1", "storage": "lvm", "shared": 0, "content": "images"},
+]
+
+
+def backup(volid):
+    return {"content": "backup", "volid": volid}
+
+
+def backup_routes(**overrides):
+    routes = {
+        "cluster/resources": lambda params: [
+            dict(res, type="storage", status="available") for res in STORAGES
+        ],
+        "nodes/pve1/storage/nfs/content": [backup("nfs:a"), {"content": "iso"}],
+        "nodes/pve2/storage/nfs/content": [backup("nfs:a")],
+        "nodes/pve1/storage/local/content": [backup("local:1")],
+        "nodes/pve2/storage/local/content": [backup("local:2")],
+    }
+    routes.update(overrides)
+    return routes
+
+
+def get_backups(manager, **filters):
+    progress = []
+
+    async def report(completed, total, message):
+        progress.append((completed, total, message))
+
+    result = asyncio.run(manager.get_backups(progress=report, **filters))
+    return result, progress
+
+
+def test_backups_read_shared_storage_once(make_manager):
+    manager = make_manager(backup_routes())
+    result, progress = get_backups(manager)
+    assert sorted(b["volid"] for b in result["backups"]) == [
+        "local:1",
+        "local:2",
+        "nfs:a",
+    ]
+    assert "nodes/pve2/storage/nfs/content" not in manager.proxmox.calls
+    assert [(completed, total) for completed, total, _ in progress] == [
+        (1, 3),
+        (2, 3),
+        (3, 3),
+    ]
+    assert {message for _, _, message in progress} == {
+        "pve1/nfs",
+        "pve1/local",
+        "pve2/local",
+    }
+
+
+def test_backups_node_filter(make_manager):
+    manager = make_manager(backup_routes())
+    result, progress = get_backups(manager, node="pve2")
+    assert sorted(b["volid"] for b in result["backups"]) == ["local:2", "nfs:a"]
+    assert {b["node"] for b in result["backups"]} == {"pve2"}
+    assert [total for _, total, _ in progress] == [2, 2]
+
+
+def test_backups_storage_filter(make_manager):
+    manager = make_manager(backup_routes())
+    result, progress = get_backups(manager, storage="local")
+    assert sorted((b["node"], b["volid"]) for b in result["backups"]) == [
+        ("pve1", "local:1"),
+        ("pve2", "local:2"),
+    ]
+    assert len(progress) == 2
+
+
+def test_backups_survive_one_failing_target(make_manager):
+    routes = backup_routes(
+        **{"nodes/pve2/storage/local/content": RuntimeError("storage offline")}
+    )
+    manager = make_manager(routes)
+    result, progress = get_backups(manager)
+    assert sorted(b["volid"] for b in result["backups"]) == ["local:1", "nfs:a"]
+    assert result["count"] == 2
+    assert len(progress) == 3
+
+
+def test_storage_details_prefers_available_node(make_manager):
+    manager = make_manager(
+        {
+            "storage/nfs": {"type": "nfs", "content": "backup,iso", "shared": 1},
+            "cluster/resources": [
+                {"storage": "nfs", "node": "pve1", "status": "unknown", "maxdisk": 0},
+                {
+                    "storage": "nfs",
+                    "node": "pve2",
+                    "status": "available",
+                    "maxdisk": 100,
+                    "disk": 30,
+                },
+                {"storage": "local", "node": "pve2", "status": "available"},
+            ],
+        }
+    )
+    details = asyncio.run(manager.get_storage_details("nfs"))
+    assert details["content"] == ["backup", "iso"]
+    assert details["status"] == {
+        "total": 100,
+        "used": 30,
+        "available": 70,
+        "active": 1,
+    }